@@ -0,0 +1,57 @@
+"""Compare the streaming Atom parser with feedparser on recorded arXiv feeds.
+
+Usage: python benchmarks/bench_atom.py FEED.xml [FEED.xml ...]
+
+Record a feed with e.g.
+  curl -o cs_LG.xml 'https://export.arxiv.org/api/query?search_query=cat:cs.LG&max_results=2000'
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import feedparser
+
+from arxiv_digest.atom import AtomStreamParser
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _measure(func: Callable[[], int]) -> tuple[int, float, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / (1024 * 1024)
+
+
+def _feedparser(path: Path) -> int:
+    return len(feedparser.parse(path.read_text(encoding="utf-8")).entries)
+
+
+def _stream(path: Path) -> int:
+    parser = AtomStreamParser(wanted=[], fallback_category="bench")
+    count = 0
+    with path.open("rb") as handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            count += len(parser.feed(chunk))
+    return count + len(parser.close())
+
+
+def main(paths: list[str]) -> None:
+    print(f"{'feed':<32}{'parser':<12}{'entries':>8}{'seconds':>10}{'peak MiB':>10}")
+    for raw_path in paths:
+        path = Path(raw_path)
+        for name, func in (("feedparser", _feedparser), ("stream", _stream)):
+            count, elapsed, peak = _measure(lambda: func(path))
+            print(f"{path.name:<32}{name:<12}{count:>8}{elapsed:>10.3f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
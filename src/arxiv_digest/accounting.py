@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime
+import json
+import math
+from pathlib import Path
+import threading
+from typing import Any, Iterable
+
+from .storage import DATE_DIR_FORMAT, LEGACY_DATE_PATTERN
+
+
+LEDGER_FILE = "ledger.jsonl"
+
+
+def parse_prices(value: str | None) -> dict[str, tuple[float, float]]:
+    """Parse ``model=input/output`` pairs, in USD per million tokens.
+
+    ``"gpt-4o-mini=0.15/0.6, gpt-4.1=2/8"`` maps each model to its input
+    and output price; malformed entries are ignored.
+    """
+    prices: dict[str, tuple[float, float]] = {}
+    for item in (value or "").split(","):
+        model, _, rates = item.strip().partition("=")
+        prompt_rate, _, completion_rate = rates.partition("/")
+        try:
+            prices[model.strip()] = (float(prompt_rate), float(completion_rate or 0))
+        except ValueError:
+            continue
+    return prices
+
+
+def usage_from_payload(payload: dict[str, Any]) -> tuple[int, int] | None:
+    """Token usage reported in a chat, responses or stream payload."""
+    usage = payload.get("usage") or {}
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion = usage.get("completion_tokens", usage.get("output_tokens"))
+    if prompt is None or completion is None:
+        return None
+    return int(prompt), int(completion)
+
+
+class Ledger:
+    """Append-only record of model calls, one JSONL file per digest date.
+
+    Each line holds the model, purpose, token counts, latency and the cost
+    estimated from ``prices`` (``None`` for models without a price);
+    ``discarded`` marks hedged duplicates whose answer was not used and
+    ``batched`` marks Batch API requests, whose ``seconds`` is the wall time
+    of the whole batch rather than the latency of one request.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ) -> None:
+        self.data_dir = data_dir
+        self.prices = prices or {}
+        self._lock = threading.Lock()
+
+    def cost(
+        self, model: str, prompt_tokens: int, completion_tokens: int
+    ) -> float | None:
+        if model not in self.prices:
+            return None
+        prompt_rate, completion_rate = self.prices[model]
+        return (prompt_tokens * prompt_rate + completion_tokens * completion_rate) / 1e6
+
+    def record(
+        self,
+        target_date: date,
+        *,
+        model: str,
+        purpose: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        seconds: float,
+        cached: bool = False,
+        estimated: bool = False,
+        discarded: bool = False,
+        batched: bool = False,
+        discount: float = 1.0,
+    ) -> dict[str, Any]:
+        if cached:
+            cost: float | None = 0.0
+        else:
+            cost = self.cost(model, prompt_tokens, completion_tokens)
+            if cost is not None:
+                cost *= discount
+        entry = {
+            "at": datetime.utcnow().isoformat(timespec="seconds"),
+            "model": model,
+            "purpose": purpose,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "seconds": round(seconds, 3),
+            "cost": round(cost, 6) if cost is not None else None,
+            "cached": cached,
+            "estimated": estimated,
+            "discarded": discarded,
+            "batched": batched,
+        }
+        day_dir = Path(self.data_dir) / target_date.strftime(DATE_DIR_FORMAT)
+        path = day_dir / LEDGER_FILE
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+
+def load_ledger(
+    data_dir: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict[date, list[dict[str, Any]]]:
+    entries: dict[date, list[dict[str, Any]]] = {}
+    for path in sorted(Path(data_dir).glob(f"*/{LEDGER_FILE}")):
+        if not LEGACY_DATE_PATTERN.fullmatch(path.parent.name):
+            continue
+        day = date.fromisoformat(path.parent.name)
+        if (date_from and day < date_from) or (date_to and day > date_to):
+            continue
+        lines = path.read_text(encoding="utf-8").splitlines()
+        entries[day] = [json.loads(line) for line in lines if line.strip()]
+    return entries
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _summarize(entries: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    entries = list(entries)
+    live = [entry for entry in entries if not entry.get("cached")]
+    discarded = [entry for entry in live if entry.get("discarded")]
+    # A batch request's wall time is queueing, not latency.
+    latencies = [entry["seconds"] for entry in live if not entry.get("batched")]
+    costs = [entry["cost"] for entry in entries if entry.get("cost") is not None]
+    return {
+        "calls": len(entries),
+        "cached": len(entries) - len(live),
+        "prompt_tokens": sum(entry["prompt_tokens"] for entry in live),
+        "completion_tokens": sum(entry["completion_tokens"] for entry in live),
+        "cost": sum(costs),
+        "priced": len(costs) == len(entries),
+        "discarded": len(discarded),
+        "batched": sum(1 for entry in live if entry.get("batched")),
+        "discarded_tokens": sum(
+            entry["prompt_tokens"] + entry["completion_tokens"] for entry in discarded
+        ),
+        "discarded_cost": sum(entry.get("cost") or 0.0 for entry in discarded),
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=0.0),
+    }
+
+
+def format_report(ledger: dict[date, list[dict[str, Any]]]) -> str:
+    """Plain-text table of calls, tokens, cost and latency per day and model."""
+    header = (
+        f"{'':<28}{'calls':>7}{'cached':>8}{'prompt':>10}{'output':>9}"
+        f"{'cost $':>10}{'p50 s':>8}{'p90 s':>8}{'p99 s':>8}{'max s':>8}"
+    )
+
+    def row(label: str, stats: dict[str, Any]) -> str:
+        cost = f"{stats['cost']:.4f}" + ("" if stats["priced"] else "*")
+        return (
+            f"{label:<28}{stats['calls']:>7}{stats['cached']:>8}"
+            f"{stats['prompt_tokens']:>10}{stats['completion_tokens']:>9}{cost:>10}"
+            f"{stats['p50']:>8.1f}{stats['p90']:>8.1f}{stats['p99']:>8.1f}"
+            f"{stats['max']:>8.1f}"
+        )
+
+    if not ledger:
+        return "No ledger entries found."
+    lines = [header]
+    by_model: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for day, entries in sorted(ledger.items()):
+        lines.append(row(day.isoformat(), _summarize(entries)))
+        for entry in entries:
+            by_model[entry["model"]].append(entry)
+    lines.append("")
+    for model, entries in sorted(by_model.items()):
+        lines.append(row(model[:27], _summarize(entries)))
+    lines.append("")
+    total = _summarize(entry for entries in ledger.values() for entry in entries)
+    lines.append(row("total", total))
+    if total["discarded"]:
+        lines.append(
+            f"discarded hedge calls: {total['discarded']}, "
+            f"{total['discarded_tokens']} tokens, ${total['discarded_cost']:.4f}"
+        )
+    if total["batched"]:
+        lines.append(
+            f"batch calls: {total['batched']}, left out of the latency columns"
+        )
+    if not total["priced"]:
+        lines.append("* some calls have no configured price (OPENAI_PRICES)")
+    return "\n".join(lines)
@@ -1,70 +1,508 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import Iterable
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+import threading
+from typing import Callable, Iterable, Protocol, Sequence, TypeVar
 from urllib.parse import urlencode
 
-import feedparser
 import httpx
 from loguru import logger
 
+from .atom import AtomStreamParser
+from .http_cache import HttpCache
 from .models import Paper
+from .ratelimit import RetryStats, TokenBucket, backoff_delay, parse_retry_after
 
 
 ARXIV_API = "https://export.arxiv.org/api/query"
+# Submissions can be announced a few days after their ``published`` time
+# (weekends, holds), so only older entries count as revisions of old papers.
+ANNOUNCE_LAG = timedelta(days=3)
+HEADERS = {"User-Agent": "arxiv-digest/0.1 (+https://arxiv.org)"}
 
 
-def _build_query(category: str, target_date: date) -> str:
+def _build_query(
+    categories: Sequence[str],
+    target_date: date,
+    since: datetime | None = None,
+) -> str:
     date_str = target_date.strftime("%Y%m%d")
     date_from = f"{date_str}0000"
     date_to = f"{date_str}2359"
-    return f"cat:{category} AND submittedDate:[{date_from} TO {date_to}]"
+    if len(categories) == 1:
+        cat_query = f"cat:{categories[0]}"
+    else:
+        cat_query = "(" + " OR ".join(f"cat:{item}" for item in categories) + ")"
+    if since is not None:
+        # Minute granularity: the boundary minute is refetched and filtered locally.
+        since_str = since.strftime("%Y%m%d%H%M")
+        return f"{cat_query} AND lastUpdatedDate:[{since_str} TO {date_to}]"
+    return f"{cat_query} AND submittedDate:[{date_from} TO {date_to}]"
 
 
-def _normalize_title(value: str) -> str:
-    return " ".join(value.split())
+def _newer_than_watermark(paper: Paper, watermarks: dict[str, datetime]) -> bool:
+    """Updated after the watermark and not a revision of a long-published paper."""
+    return any(
+        category not in watermarks
+        or (
+            paper.updated > watermarks[category]
+            and paper.published > watermarks[category] - ANNOUNCE_LAG
+        )
+        for category in paper.categories
+    )
 
 
-def _parse_datetime(value: str) -> datetime:
-    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+def dedupe_papers(papers: Iterable[Paper]) -> list[Paper]:
+    """Merge cross-listed duplicates by canonical arXiv id, keeping first-seen order."""
+    merged: dict[str, Paper] = {}
+    for paper in papers:
+        key = paper.canonical_id
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = paper
+            continue
+        extra = [item for item in paper.categories if item not in existing.categories]
+        newer = paper if paper.updated > existing.updated else existing
+        merged[key] = replace(newer, categories=existing.categories + extra)
+    return list(merged.values())
 
 
-def fetch_papers(
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class FeedParser(Protocol):
+    def feed(self, data: bytes) -> list[Paper]: ...
+
+    def close(self) -> list[Paper]: ...
+
+
+P = TypeVar("P", bound=FeedParser)
+
+
+class ArxivHttpClient:
+    """Async HTTP layer for arXiv endpoints.
+
+    Requests share a token bucket (one request per ``min_interval`` seconds
+    unless a shared ``limiter`` is passed) and run at most ``concurrency`` at
+    a time; arXiv's API terms allow a single connection, hence the default.
+    ``connections`` caps open requests across clients in other threads, as
+    in a backfill. Transient failures are retried with jittered exponential
+    backoff that honours ``Retry-After``, and ``stats`` counts requests,
+    retries and seconds spent throttled. With a ``cache``, bodies are stored
+    on disk and revalidated with conditional requests; ``cache_immutable``
+    marks them final, so later runs answer them without a request.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 30.0,
+        concurrency: int = 1,
+        min_interval: float = 3.0,
+        limiter: TokenBucket | None = None,
+        connections: threading.Semaphore | None = None,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        cache: HttpCache | None = None,
+        cache_immutable: bool = False,
+    ) -> None:
+        rate = 1.0 / min_interval if min_interval > 0 else 0.0
+        self.limiter = limiter or TokenBucket(rate=rate)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.stats = RetryStats()
+        self.cache = cache
+        self.cache_immutable = cache_immutable
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._connections = connections
+        self._client = httpx.AsyncClient(timeout=timeout, headers=HEADERS)
+
+    async def __aenter__(self) -> "ArxivHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[None]:
+        """Hold a local slot and, if shared across threads, a global one."""
+        async with self._semaphore:
+            if self._connections is None:
+                yield
+                return
+            # Polling rather than a blocking acquire in a worker thread keeps
+            # cancellation from leaking a slot.
+            while not self._connections.acquire(blocking=False):
+                await asyncio.sleep(0.05)
+            try:
+                yield
+            finally:
+                self._connections.release()
+
+    async def iter_bytes(self, url: str) -> AsyncIterator[bytes]:
+        """Stream a response body; failures before the first byte are retried."""
+        entry = self.cache.lookup(url) if self.cache else None
+        if self.cache and entry and entry.immutable:
+            logger.debug("Serving arXiv feed from cache: {}", url)
+            for chunk in self.cache.serve(entry):
+                yield chunk
+            return
+        headers = entry.validators() if entry else {}
+
+        attempt = 0
+        while True:
+            retry_after: float | None = None
+            started = False
+            async with self._connection():
+                waited = await self.limiter.acquire_async()
+                self.stats.record(requests=1, throttled=waited)
+                logger.info("Fetching arXiv feed: {}", url)
+                try:
+                    async with self._client.stream(
+                        "GET", url, headers=headers
+                    ) as response:
+                        if self.cache and entry and response.status_code == 304:
+                            self.cache.revalidate(entry, immutable=self.cache_immutable)
+                            for chunk in self.cache.read(entry):
+                                started = True
+                                yield chunk
+                            return
+                        if (
+                            response.status_code not in RETRY_STATUSES
+                            or attempt >= self.max_retries
+                        ):
+                            response.raise_for_status()
+                            writer = self.cache.writer(url) if self.cache else None
+                            try:
+                                async for chunk in response.aiter_bytes():
+                                    started = True
+                                    if writer:
+                                        writer.write(chunk)
+                                    yield chunk
+                            except BaseException:
+                                if writer:
+                                    writer.abort()
+                                raise
+                            if writer:
+                                writer.commit(
+                                    etag=response.headers.get("ETag"),
+                                    last_modified=response.headers.get("Last-Modified"),
+                                    immutable=self.cache_immutable,
+                                )
+                            return
+                        reason = f"HTTP {response.status_code}"
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                except httpx.TransportError as exc:
+                    if started or attempt >= self.max_retries:
+                        raise
+                    reason = repr(exc)
+            delay = backoff_delay(
+                attempt,
+                base=self.backoff_base,
+                cap=self.backoff_cap,
+                retry_after=retry_after,
+            )
+            attempt += 1
+            logger.warning(
+                "arXiv request failed ({}), retry {}/{} in {:.1f}s",
+                reason,
+                attempt,
+                self.max_retries,
+                delay,
+            )
+            self.stats.record(retries=1, throttled=delay)
+            await asyncio.sleep(delay)
+
+    async def get_bytes(self, url: str) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_bytes(url)])
+
+    async def parse(
+        self, url: str, new_parser: Callable[[], P]
+    ) -> tuple[P, list[Paper]]:
+        """Stream ``url`` through a fresh parser, restarting if the body breaks off.
+
+        ``iter_bytes`` only retries failures before the first byte; a drop
+        mid-body discards the partial parse (and cache entry) and refetches
+        the whole page, up to ``max_retries`` times.
+        """
+        attempt = 0
+        while True:
+            parser = new_parser()
+            papers: list[Paper] = []
+            received = False
+            try:
+                async for chunk in self.iter_bytes(url):
+                    received = True
+                    papers.extend(parser.feed(chunk))
+            except httpx.TransportError as exc:
+                if not received or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(
+                    attempt, base=self.backoff_base, cap=self.backoff_cap
+                )
+                attempt += 1
+                logger.warning(
+                    "arXiv response broke off ({!r}), refetch {}/{} in {:.1f}s",
+                    exc,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                self.stats.record(retries=1, throttled=delay)
+                await asyncio.sleep(delay)
+                continue
+            papers.extend(parser.close())
+            return parser, papers
+
+
+def _page_url(api_url: str, query: str, start: int, page_size: int) -> str:
+    params = {
+        "search_query": query,
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+        "start": start,
+        "max_results": page_size,
+    }
+    return f"{api_url}?{urlencode(params)}"
+
+
+async def _parse_page(
+    client: ArxivHttpClient,
+    url: str,
+    wanted: Sequence[str],
+    fallback_category: str | None,
+) -> tuple[list[Paper], int | None]:
+    parser, papers = await client.parse(
+        url, lambda: AtomStreamParser(wanted, fallback_category)
+    )
+    return papers, parser.total_results
+
+
+async def _fetch_query(
+    client: ArxivHttpClient,
+    api_url: str,
+    query: str,
+    label: str,
+    page_size: int,
+    max_results: int,
+    wanted: Sequence[str],
+    fallback_category: str | None = None,
+) -> list[Paper]:
+    first_url = _page_url(api_url, query, 0, page_size)
+    papers, total = await _parse_page(client, first_url, wanted, fallback_category)
+    total = min(total if total is not None else len(papers), max_results)
+    if total > page_size:
+        logger.info("{} has {} results, paging by {}", label, total, page_size)
+
+    # Remaining pages are requested together; the shared limiter spaces them out
+    # and each one is parsed while its body is still arriving.
+    urls = [
+        _page_url(api_url, query, start, page_size)
+        for start in range(page_size, total, page_size)
+    ]
+    pages = await asyncio.gather(
+        *(_parse_page(client, url, wanted, fallback_category) for url in urls)
+    )
+    for url, (page, _) in zip(urls, pages):
+        if not page:
+            logger.warning("Empty arXiv page for {}: {}", label, url)
+        papers.extend(page)
+    return papers[:max_results]
+
+
+async def _fetch_category(
+    client: ArxivHttpClient,
+    api_url: str,
+    category: str,
+    categories: list[str],
+    target_date: date,
+    page_size: int,
+    max_results: int,
+    watermarks: dict[str, datetime],
+) -> list[Paper]:
+    query = _build_query([category], target_date, watermarks.get(category))
+    # Tag every requested category up front so cross-listed copies merge cleanly.
+    return await _fetch_query(
+        client,
+        api_url,
+        query,
+        category,
+        page_size,
+        max_results,
+        categories,
+        fallback_category=category,
+    )
+
+
+async def _fetch_combined(
+    client: ArxivHttpClient,
+    api_url: str,
+    categories: list[str],
+    target_date: date,
+    page_size: int,
+    max_results: int,
+    watermarks: dict[str, datetime],
+) -> list[Paper]:
+    """Fetch all categories with one OR query and split entries locally."""
+    since = None
+    if all(category in watermarks for category in categories):
+        since = min(watermarks[category] for category in categories)
+    query = _build_query(categories, target_date, since)
+    papers = await _fetch_query(
+        client,
+        api_url,
+        query,
+        ",".join(categories),
+        page_size,
+        max_results * len(categories),
+        categories,
+    )
+    by_category: dict[str, list[Paper]] = {category: [] for category in categories}
+    for paper in papers:
+        by_category[paper.primary_category].append(paper)
+    return [paper for category in categories for paper in by_category[category]]
+
+
+async def fetch_papers_async(
     categories: Iterable[str],
     target_date: date,
-    max_results: int = 200,
+    max_results: int = 10000,
     timeout: float = 30.0,
+    *,
+    page_size: int = 200,
+    concurrency: int = 1,
+    min_interval: float = 3.0,
+    max_retries: int = 5,
+    limiter: TokenBucket | None = None,
+    connections: threading.Semaphore | None = None,
+    api_url: str = ARXIV_API,
+    combined: bool = False,
+    cache: HttpCache | None = None,
+    cache_horizon_days: int = 7,
+    watermarks: dict[str, datetime] | None = None,
 ) -> list[Paper]:
-    headers = {"User-Agent": "arxiv-digest/0.1 (+https://arxiv.org)"}
-    results: list[Paper] = []
-
-    with httpx.Client(timeout=timeout, headers=headers) as client:
-        for category in categories:
-            query = _build_query(category, target_date)
-            params = {
-                "search_query": query,
-                "sortBy": "submittedDate",
-                "sortOrder": "descending",
-                "start": 0,
-                "max_results": max_results,
-            }
-            url = f"{ARXIV_API}?{urlencode(params)}"
-            logger.info("Fetching arXiv feed: {}", url)
-            response = client.get(url)
-            response.raise_for_status()
-            feed = feedparser.parse(response.text)
-
-            for entry in feed.entries:
-                paper = Paper(
-                    paper_id=entry.id,
-                    title=_normalize_title(entry.title),
-                    summary=" ".join(entry.summary.split()),
-                    authors=[author.name for author in entry.authors],
-                    link=entry.link,
-                    category=category,
-                    published=_parse_datetime(entry.published),
-                    updated=_parse_datetime(entry.updated),
+    """Fetch papers submitted on ``target_date``.
+
+    With ``watermarks`` (latest ``updated`` seen per category), categories
+    that have one no later than ``target_date`` are fetched incrementally
+    instead: everything updated after the watermark up to the end of
+    ``target_date``, minus revisions of papers published well before it.
+    """
+    categories = list(categories)
+    # A watermark past the target day would invert the query range; such
+    # categories fall back to the submittedDate window.
+    watermarks = {
+        category: mark
+        for category, mark in (watermarks or {}).items()
+        if mark.date() <= target_date
+    }
+    # Submissions for a day stop changing once it is well in the past.
+    immutable = (date.today() - target_date).days > cache_horizon_days
+    async with ArxivHttpClient(
+        timeout=timeout,
+        concurrency=concurrency,
+        min_interval=min_interval,
+        limiter=limiter,
+        connections=connections,
+        max_retries=max_retries,
+        cache=cache,
+        cache_immutable=immutable,
+    ) as client:
+        if combined and categories:
+            papers = await _fetch_combined(
+                client,
+                api_url,
+                categories,
+                target_date,
+                page_size,
+                max_results,
+                watermarks,
+            )
+        else:
+            batches = await asyncio.gather(
+                *(
+                    _fetch_category(
+                        client,
+                        api_url,
+                        category,
+                        categories,
+                        target_date,
+                        page_size,
+                        max_results,
+                        watermarks,
+                    )
+                    for category in categories
                 )
-                results.append(paper)
+            )
+            # gather keeps argument order, so results follow the configured categories.
+            papers = [paper for batch in batches for paper in batch]
+    if watermarks:
+        papers = [paper for paper in papers if _newer_than_watermark(paper, watermarks)]
+    unique = dedupe_papers(papers)
+    if len(unique) < len(papers):
+        logger.info("Merged {} cross-listed duplicates", len(papers) - len(unique))
+    stats = client.stats
+    logger.info(
+        "arXiv fetch finished: {} requests, {} retries, {:.1f}s throttled",
+        stats.requests,
+        stats.retries,
+        stats.throttled_seconds,
+    )
+    if cache:
+        logger.info(
+            "HTTP cache: {} hits, {} revalidated, {} misses",
+            cache.hits,
+            cache.revalidated,
+            cache.misses,
+        )
+    return unique
+
 
-    return results
+def fetch_papers(
+    categories: Iterable[str],
+    target_date: date,
+    max_results: int = 10000,
+    timeout: float = 30.0,
+    *,
+    page_size: int = 200,
+    concurrency: int = 1,
+    min_interval: float = 3.0,
+    max_retries: int = 5,
+    limiter: TokenBucket | None = None,
+    connections: threading.Semaphore | None = None,
+    api_url: str = ARXIV_API,
+    combined: bool = False,
+    cache: HttpCache | None = None,
+    cache_horizon_days: int = 7,
+    watermarks: dict[str, datetime] | None = None,
+) -> list[Paper]:
+    return asyncio.run(
+        fetch_papers_async(
+            categories,
+            target_date,
+            max_results,
+            timeout,
+            page_size=page_size,
+            concurrency=concurrency,
+            min_interval=min_interval,
+            max_retries=max_retries,
+            limiter=limiter,
+            connections=connections,
+            api_url=api_url,
+            combined=combined,
+            cache=cache,
+            cache_horizon_days=cache_horizon_days,
+            watermarks=watermarks,
+        )
+    )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from loguru import logger
+
+from .models import Paper
+
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+OPENSEARCH_NS = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+
+def _text(elem: Element | None) -> str:
+    if elem is None or elem.text is None:
+        return ""
+    return " ".join(elem.text.split())
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def match_categories(terms: Sequence[str], wanted: Sequence[str]) -> list[str]:
+    """Requested categories among ``terms`` (primary first), without repeats."""
+    matched: list[str] = []
+    for term in terms:
+        if term in wanted and term not in matched:
+            matched.append(term)
+    return matched
+
+
+class AtomStreamParser:
+    """Incremental parser for arXiv API Atom feeds.
+
+    Bytes are pushed with ``feed`` as they arrive and finished entries come
+    back as ``Paper`` objects straight away; parsed elements are dropped
+    from the tree so memory stays flat regardless of page size. Entries are
+    tagged with the ``wanted`` categories they belong to, or with
+    ``fallback_category`` when none match.
+    """
+
+    def __init__(
+        self,
+        wanted: Sequence[str],
+        fallback_category: str | None = None,
+    ) -> None:
+        self.wanted = list(wanted)
+        self.fallback_category = fallback_category
+        self.total_results: int | None = None
+        self.skipped = 0
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._root: Element | None = None
+
+    def feed(self, data: bytes) -> list[Paper]:
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[Paper]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[Paper]:
+        papers: list[Paper] = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            if elem.tag == f"{OPENSEARCH_NS}totalResults":
+                self.total_results = int(_text(elem) or 0)
+            elif elem.tag == f"{ATOM_NS}entry":
+                paper = self._to_paper(elem)
+                if paper is not None:
+                    papers.append(paper)
+                if self._root is not None:
+                    self._root.remove(elem)
+        return papers
+
+    def _to_paper(self, entry: Element) -> Paper | None:
+        paper_id = _text(entry.find(f"{ATOM_NS}id"))
+        if "/api/errors" in paper_id:
+            logger.warning(
+                "arXiv API error: {}", _text(entry.find(f"{ATOM_NS}summary"))
+            )
+            self.skipped += 1
+            return None
+
+        primary = entry.find(f"{ARXIV_NS}primary_category")
+        terms = [primary.get("term", "")] if primary is not None else []
+        terms.extend(item.get("term", "") for item in entry.iter(f"{ATOM_NS}category"))
+        categories = match_categories(terms, self.wanted)
+        if not categories and self.fallback_category:
+            categories = [self.fallback_category]
+        if not categories:
+            logger.warning("Skipping entry outside requested categories: {}", paper_id)
+            self.skipped += 1
+            return None
+
+        link = ""
+        for item in entry.iter(f"{ATOM_NS}link"):
+            if item.get("rel", "alternate") == "alternate":
+                link = item.get("href", "")
+                break
+        return Paper(
+            paper_id=paper_id,
+            title=_text(entry.find(f"{ATOM_NS}title")),
+            summary=_text(entry.find(f"{ATOM_NS}summary")),
+            authors=[
+                _text(author.find(f"{ATOM_NS}name"))
+                for author in entry.iter(f"{ATOM_NS}author")
+            ],
+            link=link or paper_id,
+            categories=categories,
+            published=_parse_datetime(_text(entry.find(f"{ATOM_NS}published"))),
+            updated=_parse_datetime(_text(entry.find(f"{ATOM_NS}updated"))),
+        )
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+from datetime import date
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+from openai import OpenAI
+
+from .accounting import usage_from_payload
+from .compaction import CompactionPolicy, expand_links, link_map
+from .llm_cache import LLMCache
+from .llm_scheduler import LLMScheduler
+from .models import Paper
+from .summarizer import (
+    PROMPT_TEMPLATE_VERSION,
+    LLMResources,
+    build_prompt,
+    parse_or_repair,
+    plan_chunks,
+    summarize_papers_stream,
+    summary_validator,
+)
+from .tokens import Tokenizer
+
+
+T = TypeVar("T")
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+# Batch requests are billed at half the synchronous price.
+BATCH_DISCOUNT = 0.5
+
+
+def _custom_id(chunk_index: int) -> str:
+    return f"chunk-{chunk_index:03d}"
+
+
+def _chunk_index(custom_id: str) -> int:
+    return int(custom_id.rsplit("-", 1)[-1])
+
+
+def write_batch_input(
+    path: Path,
+    model: str,
+    target_date: date,
+    chunks: list[tuple[int, list[Paper]]],
+    compaction: CompactionPolicy | None = None,
+) -> None:
+    """Write one chat completion request per chunk in Batch API JSONL."""
+    lines = [
+        json.dumps(
+            {
+                "custom_id": _custom_id(chunk_index),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": model,
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": build_prompt(target_date, chunk, compaction),
+                        }
+                    ],
+                    "temperature": 0.2,
+                },
+            },
+            ensure_ascii=False,
+        )
+        for chunk_index, chunk in chunks
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _retrying(scheduler: LLMScheduler | None, call: Callable[[], T]) -> T:
+    """Run a Batch API control call with the scheduler's retry and backoff.
+
+    The client has SDK retries turned off, and a poll can last hours, so a
+    single transient error would otherwise abort the whole run.
+    """
+    if scheduler is None:
+        return call()
+    return scheduler.run("batch-api", 0, call)
+
+
+def _cached_chunks(
+    cache: LLMCache | None,
+    model: str,
+    target_date: date,
+    chunks: list[tuple[int, list[Paper]]],
+    compaction: CompactionPolicy | None,
+    validate: Callable[[str], bool],
+) -> set[int]:
+    """Chunks whose prompt already has a usable completion in the LLM cache."""
+    if cache is None:
+        return set()
+    hits = set()
+    for chunk_index, chunk in chunks:
+        prompt = build_prompt(target_date, chunk, compaction)
+        text = cache.peek(LLMCache.key(model, PROMPT_TEMPLATE_VERSION, prompt))
+        if text is not None and validate(text):
+            hits.add(chunk_index)
+    return hits
+
+
+def _submit(
+    client: OpenAI,
+    input_path: Path,
+    model: str,
+    target_date: date,
+    chunk_indices: list[int],
+    total_chunks: int,
+    scheduler: LLMScheduler | None = None,
+) -> dict[str, Any]:
+    uploaded = _retrying(
+        scheduler, lambda: client.files.create(file=input_path, purpose="batch")
+    )
+    batch = _retrying(
+        scheduler,
+        lambda: client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+            metadata={"date": target_date.isoformat()},
+        ),
+    )
+    logger.info(
+        "Submitted batch {} with {} chunks for {}",
+        batch.id,
+        len(chunk_indices),
+        target_date,
+    )
+    return {
+        "batch_id": batch.id,
+        "input_file_id": uploaded.id,
+        "model": model,
+        "prompt_version": PROMPT_TEMPLATE_VERSION,
+        "total_chunks": total_chunks,
+        "chunks": chunk_indices,
+        "status": batch.status,
+    }
+
+
+def _poll(
+    client: OpenAI,
+    batch_id: str,
+    poll_interval: float,
+    scheduler: LLMScheduler | None = None,
+) -> Any:
+    while True:
+        batch = _retrying(scheduler, lambda: client.batches.retrieve(batch_id))
+        counts = batch.request_counts
+        logger.info(
+            "Batch {} {}: {}/{} done, {} failed",
+            batch_id,
+            batch.status,
+            counts.completed if counts else 0,
+            counts.total if counts else 0,
+            counts.failed if counts else 0,
+        )
+        if batch.status in TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def _wall_seconds(batch: Any) -> float:
+    """Seconds from submission until the batch reached its final state."""
+    finished = (
+        getattr(batch, "completed_at", None)
+        or getattr(batch, "failed_at", None)
+        or getattr(batch, "expired_at", None)
+        or getattr(batch, "cancelled_at", None)
+    )
+    created = getattr(batch, "created_at", None)
+    if not finished or not created:
+        return 0.0
+    return float(max(finished - created, 0))
+
+
+def summarize_papers_batch(
+    client: OpenAI,
+    model: str,
+    target_date: date,
+    papers: list[Paper],
+    *,
+    input_path: Path,
+    chunk_size: int = 20,
+    token_budget: int | None = None,
+    tokenizer: Tokenizer | None = None,
+    existing_chunks: dict[int, dict[str, Any]] | None = None,
+    job: dict[str, Any] | None = None,
+    on_job: Callable[[dict[str, Any]], None] | None = None,
+    on_response: Callable[[int, dict[str, Any]], None] | None = None,
+    on_summary: Callable[[int, dict[str, Any]], None] | None = None,
+    poll_interval: float = 60.0,
+    max_concurrency: int = 1,
+    resources: LLMResources | None = None,
+    chunks: list[list[Paper]] | None = None,
+    compaction: CompactionPolicy | None = None,
+) -> list[tuple[int, dict[str, Any]]]:
+    """Summarize chunks through the Batch API instead of interactive calls.
+
+    The job record is handed to ``on_job`` as soon as the batch is created
+    and again when it finishes; passing it back as ``job`` resumes polling
+    the same batch after a crash instead of submitting a new one. Chunks
+    already in the LLM cache are not submitted, and those together with
+    chunks the batch does not return are summarized interactively afterwards.
+    """
+    if not papers:
+        return []
+
+    if chunks is None:
+        chunks = plan_chunks(
+            papers,
+            chunk_size=chunk_size,
+            token_budget=token_budget,
+            tokenizer=tokenizer,
+            compaction=compaction,
+        )
+    results = dict(existing_chunks or {})
+    pending = [
+        (chunk_index, chunk)
+        for chunk_index, chunk in enumerate(chunks, start=1)
+        if chunk_index not in results
+    ]
+
+    if job and (
+        job.get("status") == "consumed"
+        or job.get("model") != model
+        or job.get("prompt_version") != PROMPT_TEMPLATE_VERSION
+        or job.get("total_chunks") != len(chunks)
+    ):
+        job = None
+    scheduler = resources.scheduler if resources else None
+    cache = resources.cache if resources else None
+    validate = summary_validator(resources)
+    if pending and job is None:
+        cached = _cached_chunks(
+            cache, model, target_date, pending, compaction, validate
+        )
+        if cached:
+            logger.info(
+                "{} of {} chunks are in the LLM cache; not batching them",
+                len(cached),
+                len(pending),
+            )
+        uncached = [item for item in pending if item[0] not in cached]
+        if uncached:
+            write_batch_input(input_path, model, target_date, uncached, compaction)
+            job = _submit(
+                client,
+                input_path,
+                model,
+                target_date,
+                [chunk_index for chunk_index, _ in uncached],
+                len(chunks),
+                scheduler,
+            )
+            if on_job:
+                on_job(job)
+    elif job is not None:
+        logger.info("Resuming batch {} for {}", job["batch_id"], target_date)
+
+    if job is not None:
+        batch = _poll(client, job["batch_id"], poll_interval, scheduler)
+        prompts = dict(pending)
+        ledger = resources.ledger if resources else None
+        wall_seconds = _wall_seconds(batch)
+        if batch.output_file_id:
+            output_file_id = batch.output_file_id
+            output = _retrying(
+                scheduler, lambda: client.files.content(output_file_id).text
+            )
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                chunk_index = _chunk_index(record["custom_id"])
+                response = record.get("response") or {}
+                if chunk_index in results or response.get("status_code") != 200:
+                    continue
+                body = response["body"]
+                usage = usage_from_payload(body)
+                if ledger and usage:
+                    ledger.record(
+                        target_date,
+                        model=model,
+                        purpose=f"batch chunk {chunk_index}",
+                        prompt_tokens=usage[0],
+                        completion_tokens=usage[1],
+                        seconds=wall_seconds,
+                        batched=True,
+                        discount=BATCH_DISCOUNT,
+                    )
+                text_output = body["choices"][0]["message"]["content"] or ""
+                try:
+                    summary = parse_or_repair(
+                        client,
+                        model,
+                        text_output,
+                        resources,
+                        target_date=target_date,
+                        purpose=f"batch chunk {chunk_index}",
+                    )
+                except ValueError as exc:
+                    logger.warning("Batch chunk {} unparsable: {}", chunk_index, exc)
+                    continue
+                if compaction and compaction.short_links and chunk_index in prompts:
+                    summary = expand_links(summary, link_map(prompts[chunk_index]))
+                if on_response:
+                    on_response(chunk_index, body)
+                if on_summary:
+                    on_summary(chunk_index, summary)
+                if cache and chunk_index in prompts and validate(text_output):
+                    prompt = build_prompt(
+                        target_date, prompts[chunk_index], compaction
+                    )
+                    cache.put(
+                        LLMCache.key(model, PROMPT_TEMPLATE_VERSION, prompt),
+                        model,
+                        text_output,
+                        body,
+                    )
+                results[chunk_index] = summary
+        job = {**job, "status": "consumed", "batch_status": batch.status}
+        if on_job:
+            on_job(job)
+
+    missing = [i for i in (job or {}).get("chunks", []) if i not in results]
+    if missing:
+        logger.warning(
+            "Batch returned no result for {} chunks; summarizing them directly",
+            len(missing),
+        )
+    return summarize_papers_stream(
+        client,
+        model,
+        target_date,
+        papers,
+        chunk_size=chunk_size,
+        token_budget=token_budget,
+        tokenizer=tokenizer,
+        existing_chunks=results,
+        on_response=on_response,
+        on_summary=on_summary,
+        max_concurrency=max_concurrency,
+        resources=resources,
+        chunks=chunks,
+        compaction=compaction,
+    )
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import threading
+
+from loguru import logger
+
+from .storage import load_capabilities, save_capabilities
+
+
+class CapabilityRegistry:
+    """Remembers which optional APIs each (base_url, model) pair supports.
+
+    Results are persisted under ``data_dir/state`` so later runs route calls
+    directly; entries older than ``ttl_hours`` count as unknown and get
+    probed again. ``probe_lock`` lets concurrent callers wait for a single
+    probe instead of each paying for a failed request.
+    """
+
+    def __init__(self, data_dir: str, *, ttl_hours: float = 168.0) -> None:
+        self.data_dir = data_dir
+        self.ttl = timedelta(hours=ttl_hours)
+        self._entries = load_capabilities(data_dir)
+        self._lock = threading.Lock()
+        self._probe_locks: dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def _key(base_url: str, model: str) -> str:
+        return f"{base_url.rstrip('/')}|{model}"
+
+    def get(self, base_url: str, model: str, capability: str) -> bool | None:
+        with self._lock:
+            entry = self._entries.get(self._key(base_url, model), {}).get(capability)
+        if not entry:
+            return None
+        checked_at = datetime.fromisoformat(entry["checked_at"])
+        if datetime.utcnow() - checked_at > self.ttl:
+            return None
+        return bool(entry["supported"])
+
+    def record(
+        self, base_url: str, model: str, capability: str, supported: bool
+    ) -> None:
+        key = self._key(base_url, model)
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key, {}).get(capability, {})
+            previous = entry.get("supported")
+            checked_at = entry.get("checked_at")
+            # Every call records its outcome; only a changed value or an entry
+            # halfway to expiry is worth rewriting the file for.
+            stale = (
+                checked_at is None
+                or now - datetime.fromisoformat(checked_at) > self.ttl / 2
+            )
+            self._entries.setdefault(key, {})[capability] = {
+                "supported": supported,
+                "checked_at": now.isoformat() if stale or previous != supported
+                else checked_at,
+            }
+            if previous != supported or stale:
+                save_capabilities(self.data_dir, self._entries)
+        if previous != supported:
+            logger.info(
+                "Endpoint {} model {}: {} {}",
+                base_url,
+                model,
+                capability,
+                "supported" if supported else "unsupported",
+            )
+
+    def probe_lock(self, base_url: str, model: str, capability: str) -> threading.Lock:
+        name = f"{self._key(base_url, model)}|{capability}"
+        with self._lock:
+            return self._probe_locks.setdefault(name, threading.Lock())
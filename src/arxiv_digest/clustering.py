@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from datetime import date
+import math
+from typing import Sequence
+import zlib
+
+from loguru import logger
+import numpy as np
+from openai import OpenAI
+
+from .compaction import CompactionPolicy
+from .models import Paper
+from .summarizer import build_prompt, format_paper, plan_chunks
+from .text import tokenize
+from .tokens import Tokenizer, estimate_tokens
+
+
+def paper_text(paper: Paper) -> str:
+    return f"{paper.title}. {paper.summary}"
+
+
+def hashing_tfidf(texts: Sequence[str], dim: int = 2048) -> np.ndarray:
+    """L2-normalised TF-IDF vectors over hashed unigrams and bigrams.
+
+    Hashing uses CRC32 rather than ``hash`` so vectors are stable across
+    processes, which keeps clusters reproducible between runs.
+    """
+    rows: list[int] = []
+    cols: list[int] = []
+    for row, text in enumerate(texts):
+        words = tokenize(text)
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        rows.extend([row] * len(terms))
+        cols.extend(zlib.crc32(term.encode("utf-8")) % dim for term in terms)
+    counts = np.zeros((len(texts), dim), dtype=np.float32)
+    index = (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp))
+    np.add.at(counts, index, 1)
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1
+    vectors = np.log1p(counts) * idf
+    return _normalize(vectors)
+
+
+def embed_texts(
+    client: OpenAI,
+    model: str,
+    texts: Sequence[str],
+    batch_size: int = 256,
+) -> np.ndarray:
+    vectors: list[list[float]] = []
+    for start in range(0, len(texts), batch_size):
+        response = client.embeddings.create(
+            model=model, input=list(texts[start : start + batch_size])
+        )
+        ordered = sorted(response.data, key=lambda item: item.index)
+        vectors.extend(item.embedding for item in ordered)
+    return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def kmeans(
+    vectors: np.ndarray,
+    k: int,
+    *,
+    iterations: int = 50,
+    seed: int = 0,
+) -> np.ndarray:
+    """Cluster rows of ``vectors`` with k-means++ seeding; returns labels."""
+    n = len(vectors)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    squared = np.einsum("ij,ij->i", vectors, vectors)
+    centers = np.empty((k, vectors.shape[1]), dtype=vectors.dtype)
+    centers[0] = vectors[rng.integers(n)]
+    closest = squared - 2 * vectors @ centers[0] + centers[0] @ centers[0]
+    for i in range(1, k):
+        weights = np.clip(closest, 0, None)
+        total = weights.sum()
+        pick = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centers[i] = vectors[pick]
+        distance = squared - 2 * vectors @ centers[i] + centers[i] @ centers[i]
+        closest = np.minimum(closest, distance)
+
+    labels = np.full(n, -1)
+    for _ in range(iterations):
+        center_squared = np.einsum("ij,ij->i", centers, centers)
+        distances = squared[:, None] - 2 * vectors @ centers.T + center_squared
+        new_labels = distances.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, vectors)
+        sizes = np.bincount(labels, minlength=k)[:, None]
+        # Empty clusters keep their previous center.
+        centers = np.where(sizes > 0, sums / np.maximum(sizes, 1), centers)
+    return labels
+
+
+def default_cluster_count(n: int) -> int:
+    return max(1, min(n, round(math.sqrt(n / 2))))
+
+
+def group_by_cluster(papers: list[Paper], labels: np.ndarray) -> list[list[Paper]]:
+    """Clusters in order of first appearance, papers in fetch order within each."""
+    groups: dict[int, list[Paper]] = {}
+    for paper, label in zip(papers, labels.tolist()):
+        groups.setdefault(label, []).append(paper)
+    return list(groups.values())
+
+
+def pack_clusters(
+    clusters: list[list[Paper]],
+    *,
+    chunk_size: int = 20,
+    token_budget: int | None = None,
+    tokenizer: Tokenizer | None = None,
+    compaction: CompactionPolicy | None = None,
+) -> list[list[Paper]]:
+    """Pack clusters into prompt chunks without mixing topics needlessly.
+
+    Each cluster is first split with ``plan_chunks``; full pieces become
+    chunks on their own and the leftover pieces are combined first-fit
+    decreasing, so a chunk only holds several topics when they are small.
+    """
+    count = tokenizer or estimate_tokens
+    overhead = count(build_prompt(date.today(), [], compaction))
+
+    def cost(piece: list[Paper]) -> int:
+        return sum(count(format_paper(1, paper, compaction)) + 1 for paper in piece)
+
+    chunks: list[list[Paper]] = []
+    leftovers: list[list[Paper]] = []
+    for cluster in clusters:
+        pieces = plan_chunks(
+            cluster,
+            chunk_size=chunk_size,
+            token_budget=token_budget,
+            tokenizer=count,
+            compaction=compaction,
+        )
+        chunks.extend(pieces[:-1])
+        leftovers.append(pieces[-1])
+
+    bins: list[tuple[list[Paper], int]] = []
+    for piece in sorted(leftovers, key=cost, reverse=True):
+        piece_cost = cost(piece)
+        for i, (members, used) in enumerate(bins):
+            fits_budget = not token_budget or used + piece_cost <= token_budget
+            if fits_budget and len(members) + len(piece) <= chunk_size:
+                bins[i] = (members + piece, used + piece_cost)
+                break
+        else:
+            bins.append((list(piece), overhead + piece_cost))
+    chunks.extend(members for members, _ in bins)
+    return chunks
+
+
+def cluster_chunks(
+    papers: list[Paper],
+    *,
+    chunk_size: int = 20,
+    token_budget: int | None = None,
+    tokenizer: Tokenizer | None = None,
+    client: OpenAI | None = None,
+    embedding_model: str | None = None,
+    clusters: int | None = None,
+    compaction: CompactionPolicy | None = None,
+) -> list[list[Paper]]:
+    """Plan chunks from topical clusters of ``papers``.
+
+    Papers are embedded with ``embedding_model`` when a ``client`` is given,
+    otherwise (or if the request fails) with ``hashing_tfidf``.
+    """
+    if not papers:
+        return []
+    texts = [paper_text(paper) for paper in papers]
+    vectors = None
+    if client is not None and embedding_model:
+        try:
+            vectors = embed_texts(client, embedding_model, texts)
+        except Exception as exc:
+            logger.warning("Embedding request failed, using local vectors: {}", exc)
+    if vectors is None:
+        vectors = hashing_tfidf(texts)
+    k = clusters or default_cluster_count(len(papers))
+    groups = group_by_cluster(papers, kmeans(vectors, k))
+    chunks = pack_clusters(
+        groups,
+        chunk_size=chunk_size,
+        token_budget=token_budget,
+        tokenizer=tokenizer,
+        compaction=compaction,
+    )
+    logger.info(
+        "Clustered {} papers into {} topics and {} chunks",
+        len(papers),
+        len(groups),
+        len(chunks),
+    )
+    return chunks
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+import re
+from typing import Any
+
+from .models import Paper, canonical_id
+from .text import tokenize
+from .tokens import Tokenizer, estimate_tokens
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\\$])")
+_ARXIV_PREFIX = re.compile(r"^(?:arxiv:|https?://arxiv\.org/abs/)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class CompactionPolicy:
+    """How paper entries are shortened in chunk prompts.
+
+    ``max_authors`` keeps the first authors and adds "et al." (0 keeps all),
+    ``short_links`` replaces links with arXiv ids that are expanded back
+    after the response, and ``abstract_tokens`` trims abstracts to their
+    most salient sentences within that many tokens (0 keeps them whole).
+    """
+
+    max_authors: int = 0
+    short_links: bool = False
+    abstract_tokens: int = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self.max_authors or self.short_links or self.abstract_tokens)
+
+
+def format_authors(authors: list[str], max_authors: int = 0) -> str:
+    if max_authors and len(authors) > max_authors:
+        return ", ".join(authors[:max_authors]) + " et al."
+    return ", ".join(authors)
+
+
+def short_link(paper: Paper) -> str:
+    return f"arXiv:{paper.canonical_id}"
+
+
+def trim_abstract(
+    abstract: str,
+    budget: int,
+    *,
+    title: str = "",
+    tokenizer: Tokenizer | None = None,
+) -> str:
+    """Keep the most salient sentences of ``abstract`` within ``budget`` tokens.
+
+    Sentences are scored by how frequent their words are in the abstract
+    (title words count double), with a bonus for the opening sentence; the
+    best ones that fit are kept in their original order.
+    """
+    count = tokenizer or estimate_tokens
+    if not budget or count(abstract) <= budget:
+        return abstract
+    sentences = _SENTENCE_END.split(abstract)
+    frequency = Counter(tokenize(abstract))
+    for word in tokenize(title):
+        frequency[word] += 2
+
+    def salience(position: int) -> float:
+        words = tokenize(sentences[position])
+        if not words:
+            return 0.0
+        score = sum(frequency[word] for word in words) / len(words) ** 0.5
+        return score * (1.5 if position == 0 else 1.0)
+
+    kept: list[int] = []
+    used = 0
+    for position in sorted(range(len(sentences)), key=salience, reverse=True):
+        cost = count(sentences[position]) + 1
+        if used + cost <= budget:
+            kept.append(position)
+            used += cost
+    if not kept:
+        return sentences[0]
+    return " ".join(sentences[position] for position in sorted(kept)) + " …"
+
+
+def link_map(papers: list[Paper]) -> dict[str, str]:
+    return {canonical_id(paper.paper_id): paper.link for paper in papers}
+
+
+def expand_links(value: Any, links: dict[str, str]) -> Any:
+    """Replace short arXiv ids in ``link`` fields with the full paper links."""
+    if isinstance(value, list):
+        return [expand_links(item, links) for item in value]
+    if not isinstance(value, dict):
+        return value
+    expanded = {key: expand_links(item, links) for key, item in value.items()}
+    link = expanded.get("link")
+    if isinstance(link, str):
+        key = canonical_id(_ARXIV_PREFIX.sub("", link.strip()))
+        if key in links:
+            expanded["link"] = links[key]
+    return expanded
@@ -13,17 +13,89 @@ def _split_csv(value: str | None, default: list[str]) -> list[str]:
     return [p for p in parts if p]
 
 
+@dataclass(frozen=True)
+class ProviderConfig:
+    name: str
+    base_url: str | None
+    api_key: str | None
+    weight: float = 1.0
+    concurrency: int = 4
+
+
+def _load_providers(
+    names: list[str],
+    default_api_key: str | None,
+    default_concurrency: int,
+) -> list[ProviderConfig]:
+    """Read ``OPENAI_PROVIDER_<NAME>_*`` settings for each pool member."""
+    providers = []
+    for name in names:
+        prefix = f"OPENAI_PROVIDER_{name.upper()}_"
+        providers.append(
+            ProviderConfig(
+                name=name,
+                base_url=os.getenv(prefix + "BASE_URL"),
+                api_key=os.getenv(prefix + "API_KEY", default_api_key),
+                weight=float(os.getenv(prefix + "WEIGHT", "1")),
+                concurrency=int(
+                    os.getenv(prefix + "CONCURRENCY", str(default_concurrency))
+                ),
+            )
+        )
+    return providers
+
+
 @dataclass(frozen=True)
 class AppConfig:
     categories: list[str]
+    arxiv_source: str
+    arxiv_fetch_mode: str
+    arxiv_api_url: str
+    arxiv_oai_url: str
+    arxiv_oai_window_days: int
+    arxiv_combined_query: bool
+    arxiv_page_size: int
+    arxiv_max_results: int
+    arxiv_concurrency: int
+    arxiv_min_interval: float
+    arxiv_max_retries: int
+    arxiv_http_cache: bool
+    arxiv_cache_horizon_days: int
     timezone: str
     daily_time: str
     data_dir: str
     retention_days: int
+    backfill_workers: int
+    extractive_preview: bool
     openai_base_url: str | None
     openai_chunk_model: str
+    openai_chunk_token_budget: int
+    openai_chunk_max_papers: int
+    openai_chunk_clustering: bool
+    openai_embedding_model: str | None
+    openai_prompt_max_authors: int
+    openai_prompt_short_links: bool
+    openai_prompt_abstract_tokens: int
     openai_overall_model: str
+    openai_overall_token_budget: int
     openai_api_key: str | None
+    openai_concurrency: int
+    openai_providers: list[ProviderConfig]
+    openai_rpm: float
+    openai_tpm: float
+    openai_max_retries: int
+    openai_timeout_seconds: float
+    openai_hedge: bool
+    openai_hedge_model: str | None
+    openai_prices: str | None
+    openai_stream: bool
+    openai_structured_output: bool
+    openai_batch: bool
+    openai_batch_poll_seconds: float
+    openai_capability_ttl_hours: float
+    openai_cache: bool
+    openai_cache_max_mb: int
+    openai_cache_max_age_days: float
     smtp_host: str | None
     smtp_port: int
     smtp_user: str | None
@@ -35,16 +107,74 @@ class AppConfig:
     def from_env() -> "AppConfig":
         default_categories = ["cs.SE", "cs.CV", "cs.AI", "cs.CR", "cs.LG", "cs.RO"]
         categories = _split_csv(os.getenv("ARXIV_CATEGORIES"), default_categories)
+        arxiv_source = os.getenv("ARXIV_SOURCE", "api").lower()
+        arxiv_fetch_mode = os.getenv("ARXIV_FETCH_MODE", "window").lower()
+        arxiv_oai_url = os.getenv("ARXIV_OAI_URL", "https://oaipmh.arxiv.org/oai")
+        arxiv_oai_window_days = int(os.getenv("ARXIV_OAI_WINDOW_DAYS", "1"))
+        arxiv_api_url = os.getenv(
+            "ARXIV_API_URL", "https://export.arxiv.org/api/query"
+        )
+        arxiv_combined_query = (
+            os.getenv("ARXIV_QUERY_MODE", "per_category").lower() == "combined"
+        )
+        arxiv_page_size = int(os.getenv("ARXIV_PAGE_SIZE", "200"))
+        arxiv_max_results = int(os.getenv("ARXIV_MAX_RESULTS", "10000"))
+        arxiv_concurrency = int(os.getenv("ARXIV_CONCURRENCY", "1"))
+        arxiv_min_interval = float(os.getenv("ARXIV_MIN_INTERVAL", "3.0"))
+        arxiv_max_retries = int(os.getenv("ARXIV_MAX_RETRIES", "5"))
+        arxiv_http_cache = os.getenv("ARXIV_HTTP_CACHE", "1") != "0"
+        arxiv_cache_horizon_days = int(os.getenv("ARXIV_CACHE_HORIZON_DAYS", "7"))
         timezone = os.getenv("APP_TIMEZONE", "Asia/Shanghai")
         daily_time = os.getenv("APP_DAILY_TIME", "09:00")
         data_dir = os.getenv("APP_DATA_DIR", os.path.abspath("data"))
         retention_days = int(os.getenv("APP_RETENTION_DAYS", "30"))
+        backfill_workers = int(os.getenv("APP_BACKFILL_WORKERS", "4"))
+        extractive_preview = os.getenv("APP_EXTRACTIVE_PREVIEW", "0") == "1"
         openai_base_url = os.getenv("OPENAI_BASE_URL")
         openai_chunk_model = os.getenv("OPENAI_CHUNK_MODEL", "gpt-4.1-mini")
+        openai_chunk_token_budget = int(os.getenv("OPENAI_CHUNK_TOKEN_BUDGET", "12000"))
+        openai_chunk_max_papers = int(os.getenv("OPENAI_CHUNK_MAX_PAPERS", "40"))
+        openai_chunk_clustering = os.getenv("OPENAI_CHUNK_CLUSTERING", "0") == "1"
+        openai_embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL") or None
+        openai_prompt_max_authors = int(os.getenv("OPENAI_PROMPT_MAX_AUTHORS", "0"))
+        openai_prompt_short_links = os.getenv("OPENAI_PROMPT_SHORT_LINKS", "0") == "1"
+        openai_prompt_abstract_tokens = int(
+            os.getenv("OPENAI_PROMPT_ABSTRACT_TOKENS", "0")
+        )
         openai_overall_model = os.getenv(
             "OPENAI_OVERALL_MODEL", "claude-sonnet-4-5-20250929"
         )
+        openai_overall_token_budget = int(
+            os.getenv("OPENAI_OVERALL_TOKEN_BUDGET", "24000")
+        )
         openai_api_key = os.getenv("OPENAI_API_KEY")
+        openai_providers = _load_providers(
+            _split_csv(os.getenv("OPENAI_PROVIDERS"), []),
+            openai_api_key,
+            int(os.getenv("OPENAI_CONCURRENCY", "4")),
+        )
+        # A pool defaults to enough workers to fill every endpoint.
+        default_concurrency = sum(p.concurrency for p in openai_providers) or 4
+        openai_concurrency = int(
+            os.getenv("OPENAI_CONCURRENCY", str(default_concurrency))
+        )
+        openai_rpm = float(os.getenv("OPENAI_RPM", "0"))
+        openai_tpm = float(os.getenv("OPENAI_TPM", "0"))
+        openai_max_retries = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+        openai_prices = os.getenv("OPENAI_PRICES")
+        openai_timeout_seconds = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120"))
+        openai_hedge = os.getenv("OPENAI_HEDGE", "0") == "1"
+        openai_hedge_model = os.getenv("OPENAI_HEDGE_MODEL") or None
+        openai_stream = os.getenv("OPENAI_STREAM", "0") == "1"
+        openai_structured_output = os.getenv("OPENAI_STRUCTURED_OUTPUT", "0") == "1"
+        openai_batch = os.getenv("OPENAI_BATCH", "0") == "1"
+        openai_batch_poll_seconds = float(os.getenv("OPENAI_BATCH_POLL_SECONDS", "60"))
+        openai_capability_ttl_hours = float(
+            os.getenv("OPENAI_CAPABILITY_TTL_HOURS", "168")
+        )
+        openai_cache = os.getenv("OPENAI_CACHE", "1") != "0"
+        openai_cache_max_mb = int(os.getenv("OPENAI_CACHE_MAX_MB", "200"))
+        openai_cache_max_age_days = float(os.getenv("OPENAI_CACHE_MAX_AGE_DAYS", "30"))
 
         smtp_host = os.getenv("SMTP_HOST")
         smtp_port = int(os.getenv("SMTP_PORT", "465"))
@@ -55,14 +185,54 @@ class AppConfig:
 
         return AppConfig(
             categories=categories,
+            arxiv_source=arxiv_source,
+            arxiv_fetch_mode=arxiv_fetch_mode,
+            arxiv_api_url=arxiv_api_url,
+            arxiv_oai_url=arxiv_oai_url,
+            arxiv_oai_window_days=arxiv_oai_window_days,
+            arxiv_combined_query=arxiv_combined_query,
+            arxiv_page_size=arxiv_page_size,
+            arxiv_max_results=arxiv_max_results,
+            arxiv_concurrency=arxiv_concurrency,
+            arxiv_min_interval=arxiv_min_interval,
+            arxiv_max_retries=arxiv_max_retries,
+            arxiv_http_cache=arxiv_http_cache,
+            arxiv_cache_horizon_days=arxiv_cache_horizon_days,
             timezone=timezone,
             daily_time=daily_time,
             data_dir=data_dir,
             retention_days=retention_days,
+            backfill_workers=backfill_workers,
+            extractive_preview=extractive_preview,
             openai_base_url=openai_base_url,
             openai_chunk_model=openai_chunk_model,
+            openai_chunk_token_budget=openai_chunk_token_budget,
+            openai_chunk_max_papers=openai_chunk_max_papers,
+            openai_chunk_clustering=openai_chunk_clustering,
+            openai_embedding_model=openai_embedding_model,
+            openai_prompt_max_authors=openai_prompt_max_authors,
+            openai_prompt_short_links=openai_prompt_short_links,
+            openai_prompt_abstract_tokens=openai_prompt_abstract_tokens,
             openai_overall_model=openai_overall_model,
+            openai_overall_token_budget=openai_overall_token_budget,
             openai_api_key=openai_api_key,
+            openai_concurrency=openai_concurrency,
+            openai_providers=openai_providers,
+            openai_rpm=openai_rpm,
+            openai_tpm=openai_tpm,
+            openai_max_retries=openai_max_retries,
+            openai_prices=openai_prices,
+            openai_timeout_seconds=openai_timeout_seconds,
+            openai_hedge=openai_hedge,
+            openai_hedge_model=openai_hedge_model,
+            openai_stream=openai_stream,
+            openai_structured_output=openai_structured_output,
+            openai_batch=openai_batch,
+            openai_batch_poll_seconds=openai_batch_poll_seconds,
+            openai_capability_ttl_hours=openai_capability_ttl_hours,
+            openai_cache=openai_cache,
+            openai_cache_max_mb=openai_cache_max_mb,
+            openai_cache_max_age_days=openai_cache_max_age_days,
             smtp_host=smtp_host,
             smtp_port=smtp_port,
             smtp_user=smtp_user,
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from .clustering import default_cluster_count, kmeans, paper_text
+from .models import Paper
+from .text import tokenize
+
+
+def _terms(text: str) -> list[str]:
+    words = tokenize(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def bm25_matrix(
+    texts: list[str],
+    *,
+    k1: float = 1.5,
+    b: float = 0.75,
+    min_df: int = 2,
+) -> tuple[np.ndarray, list[str]]:
+    """BM25 weights of every document against the corpus vocabulary.
+
+    Terms in fewer than ``min_df`` documents are dropped (unless that would
+    leave nothing), which keeps the matrix small and removes typos and ids.
+    """
+    docs = [_terms(text) for text in texts]
+    df: dict[str, int] = {}
+    for terms in docs:
+        for term in set(terms):
+            df[term] = df.get(term, 0) + 1
+    vocab = sorted(term for term, count in df.items() if count >= min_df)
+    if not vocab:
+        vocab = sorted(df)
+    index = {term: i for i, term in enumerate(vocab)}
+
+    counts = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+    rows = [row for row, terms in enumerate(docs) for term in terms if term in index]
+    cols = [index[term] for terms in docs for term in terms if term in index]
+    cells = (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp))
+    np.add.at(counts, cells, 1)
+
+    lengths = np.array([len(terms) for terms in docs], dtype=np.float32)
+    norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1.0))
+    doc_freq = np.array([df[term] for term in vocab], dtype=np.float32)
+    idf = np.log1p((len(docs) - doc_freq + 0.5) / (doc_freq + 0.5))
+    weights = counts * (k1 + 1) / (counts + norm[:, None]) * idf
+    return weights, vocab
+
+
+def _top_terms(scores: np.ndarray, vocab: list[str], limit: int) -> list[str]:
+    """Highest scoring terms, skipping unigrams already covered by a bigram."""
+    picked: list[str] = []
+    for i in np.argsort(-scores):
+        if scores[i] <= 0 or len(picked) >= limit:
+            break
+        term = vocab[i]
+        if any(term in chosen.split() or chosen in term.split() for chosen in picked):
+            continue
+        picked.append(term)
+    return picked
+
+
+def summarize_extractive(
+    papers: list[Paper],
+    *,
+    max_themes: int = 8,
+    max_keywords: int = 15,
+    papers_per_theme: int = 3,
+) -> dict[str, Any]:
+    """Digest ``papers`` without a model, in the same schema as the LLM summaries.
+
+    Keywords are the terms with the highest total BM25 weight, themes are
+    k-means clusters of the BM25 vectors named after their strongest terms,
+    and each theme lists the papers closest to its centroid.
+    """
+    if not papers:
+        return {}
+    weights, vocab = bm25_matrix([paper_text(paper) for paper in papers])
+    keywords = _top_terms(weights.sum(axis=0), vocab, max_keywords)
+
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    vectors = weights / np.where(norms == 0, 1, norms)
+    k = min(max_themes, default_cluster_count(len(papers)))
+    labels = kmeans(vectors, k)
+
+    clusters: list[tuple[int, dict[str, Any]]] = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        centroid = vectors[members].mean(axis=0)
+        names = _top_terms(weights[members].sum(axis=0), vocab, 3)
+        similarity = vectors[members] @ centroid
+        closest = members[np.argsort(-similarity)][:papers_per_theme]
+        theme = {
+            "name": " / ".join(names) or "其他",
+            "description": f"{len(members)} 篇论文，涉及 {', '.join(names)}。",
+            "papers": [
+                {"title": papers[i].title, "link": papers[i].link} for i in closest
+            ],
+        }
+        clusters.append((len(members), theme))
+    clusters.sort(key=lambda item: item[0], reverse=True)
+    themes = [theme for _, theme in clusters]
+
+    top = "、".join(theme["name"] for theme in themes[:3])
+    summary = (
+        f"共 {len(papers)} 篇论文，聚为 {len(themes)} 个主题，"
+        f"规模最大的是 {top}。（本摘要由关键词统计自动生成，未经模型总结。）"
+    )
+    return {"summary": summary, "keywords": keywords, "themes": themes}
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import threading
+from typing import Callable, TypeVar
+
+from .accounting import percentile
+
+
+T = TypeVar("T")
+
+# An attempt receives an event it sets once its request is actually sent,
+# so time spent waiting for rate limits or slots does not count as latency.
+Attempt = Callable[[threading.Event], T]
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedged: int = 0
+    backup_wins: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, *, hedged: bool, backup_won: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.hedged += hedged
+            self.backup_wins += backup_won
+
+
+class Hedger:
+    """Sends a backup request when a call runs past the observed latency.
+
+    Latencies of completed calls are kept in a sliding ``window``; once
+    ``min_samples`` are known, a call still running after the ``quantile``
+    latency gets a duplicate and the first answer wins. The loser cannot be
+    cancelled mid-request, so it runs to completion in the background and
+    ``on_discard`` receives its result to account for the wasted spend.
+    """
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 90,
+        min_samples: int = 5,
+        window: int = 200,
+        max_workers: int = 32,
+    ) -> None:
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def delay(self) -> float | None:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            return percentile(list(self._samples), self.quantile)
+
+    def run(
+        self,
+        primary: Attempt[T],
+        backup: Attempt[T],
+        *,
+        on_discard: Callable[[T], None] | None = None,
+    ) -> tuple[T, bool]:
+        """Return the first successful result and whether the backup produced it."""
+        delay = self.delay()
+        started = threading.Event()
+        first = self._pool.submit(primary, started)
+        if delay is None:
+            self.stats.record(hedged=False, backup_won=False)
+            return first.result(), False
+        while not started.wait(0.05):
+            if first.done():
+                break
+        if not wait([first], timeout=delay).done:
+            second = self._pool.submit(backup, threading.Event())
+            return self._race(first, second, on_discard)
+        self.stats.record(hedged=False, backup_won=False)
+        return first.result(), False
+
+    def _race(
+        self,
+        first: Future[T],
+        second: Future[T],
+        on_discard: Callable[[T], None] | None,
+    ) -> tuple[T, bool]:
+        pending = {first, second}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if on_discard:
+                    for loser in (done | pending) - {future}:
+                        loser.add_done_callback(_discard_with(on_discard))
+                backup_won = future is second
+                self.stats.record(hedged=True, backup_won=backup_won)
+                return future.result(), backup_won
+        self.stats.record(hedged=True, backup_won=False)
+        assert error is not None
+        raise error
+
+
+def _discard_with(on_discard: Callable[[T], None]) -> Callable[[Future[T]], None]:
+    def callback(future: Future[T]) -> None:
+        if future.exception() is None:
+            on_discard(future.result())
+
+    return callback
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import json
+from pathlib import Path
+import threading
+from typing import BinaryIO, Iterator
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    body_path: Path
+    etag: str | None
+    last_modified: str | None
+    immutable: bool
+    fetched_at: str
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CacheWriter:
+    """Collects a response body in a temp file and publishes it on ``commit``."""
+
+    def __init__(self, cache: "HttpCache", url: str) -> None:
+        self._cache = cache
+        self._url = url
+        self._body_path, _ = cache._paths(url)
+        self._temp_path = self._body_path.with_suffix(".body.tmp")
+        self._temp_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: BinaryIO = self._temp_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+
+    def commit(
+        self,
+        *,
+        etag: str | None,
+        last_modified: str | None,
+        immutable: bool,
+    ) -> None:
+        self._handle.close()
+        self._temp_path.replace(self._body_path)
+        self._cache._write_meta(self._url, etag, last_modified, immutable)
+
+    def abort(self) -> None:
+        self._handle.close()
+        self._temp_path.unlink(missing_ok=True)
+
+
+class HttpCache:
+    """Content-addressed on-disk cache of response bodies keyed by request URL.
+
+    Entries marked immutable are served without touching the network; other
+    entries are revalidated with ``If-None-Match``/``If-Modified-Since``.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.root / key[:2] / key
+        return base.with_suffix(".body"), base.with_suffix(".json")
+
+    def _write_meta(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        immutable: bool,
+    ) -> None:
+        _, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "immutable": immutable,
+            "fetched_at": datetime.utcnow().isoformat(),
+        }
+        temp_path = meta_path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        temp_path.replace(meta_path)
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        body_path, meta_path = self._paths(url)
+        if not body_path.exists() or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("url") != url:
+            return None
+        return CacheEntry(
+            url=url,
+            body_path=body_path,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            immutable=bool(meta.get("immutable")),
+            fetched_at=meta.get("fetched_at", ""),
+        )
+
+    def writer(self, url: str) -> CacheWriter:
+        with self._lock:
+            self.misses += 1
+        return CacheWriter(self, url)
+
+    def revalidate(self, entry: CacheEntry, *, immutable: bool) -> None:
+        """Record a 304 for ``entry`` and refresh its metadata."""
+        with self._lock:
+            self.revalidated += 1
+        self._write_meta(
+            entry.url,
+            entry.etag,
+            entry.last_modified,
+            immutable or entry.immutable,
+        )
+
+    def serve(self, entry: CacheEntry) -> Iterator[bytes]:
+        """Read ``entry`` as a fresh hit, without revalidation."""
+        with self._lock:
+            self.hits += 1
+        return self.read(entry)
+
+    def read(self, entry: CacheEntry) -> Iterator[bytes]:
+        with entry.body_path.open("rb") as handle:
+            while chunk := handle.read(CHUNK_SIZE):
+                yield chunk
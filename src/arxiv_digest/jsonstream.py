@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+
+
+class JsonStreamError(ValueError):
+    """Raised as soon as streamed text can no longer become valid JSON."""
+
+
+_LITERAL_CHARS = frozenset("+-.0123456789eEtrufalsn")
+
+
+class _Frame:
+    __slots__ = ("kind", "state", "key")
+
+    def __init__(self, kind: str, key: str | None) -> None:
+        self.kind = kind  # "{" or "["
+        self.state = "first"  # first, key, colon, value, comma
+        self.key = key  # key this container is stored under in its parent
+
+
+class JsonStreamValidator:
+    """Validates a JSON object incrementally as text arrives.
+
+    Text before the first ``{`` (a code fence, a short preamble) is skipped
+    up to ``max_prelude`` characters, and anything after the root object
+    closes is ignored, mirroring ``_parse_summary``'s fallbacks. ``feed``
+    raises ``JsonStreamError`` at the first character that cannot be part
+    of a valid document, so a bad generation can be abandoned early.
+    ``themes`` counts entries of the top-level ``themes`` array completed
+    so far.
+    """
+
+    def __init__(self, max_prelude: int = 200) -> None:
+        self.max_prelude = max_prelude
+        self.consumed = 0
+        self.done = False
+        self.themes = 0
+        self._stack: list[_Frame] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string: list[str] = []
+        self._literal: list[str] = []
+        self._last_key: str | None = None
+
+    def feed(self, text: str) -> None:
+        for char in text:
+            if self.done:
+                return
+            self.consumed += 1
+            self._step(char)
+
+    def close(self) -> None:
+        if not self.done:
+            raise JsonStreamError("stream ended before the JSON object closed")
+
+    def _fail(self, char: str) -> None:
+        raise JsonStreamError(
+            f"unexpected {char!r} at offset {self.consumed}"
+            + (f" in {self._stack[-1].kind}" if self._stack else "")
+        )
+
+    def _step(self, char: str) -> None:
+        if not self._started:
+            if char == "{":
+                self._started = True
+                self._stack.append(_Frame("{", None))
+            elif self.consumed > self.max_prelude:
+                raise JsonStreamError("no JSON object in the first characters")
+            return
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                self._end_string("".join(self._string))
+                return
+            elif char < " ":
+                self._fail(char)
+            self._string.append(char)
+            return
+
+        if self._literal:
+            if char in _LITERAL_CHARS:
+                self._literal.append(char)
+                return
+            self._end_literal()
+
+        if char in " \t\r\n":
+            return
+        frame = self._stack[-1]
+        if char == '"':
+            if frame.state in ("first", "key", "value"):
+                self._in_string = True
+                self._string = []
+                return
+            self._fail(char)
+        if char in "{[":
+            if not self._expects_value(frame):
+                self._fail(char)
+            key = self._last_key if frame.kind == "{" else None
+            self._stack.append(_Frame(char, key))
+            return
+        if char in "}]":
+            closes = "{" if char == "}" else "["
+            if frame.kind != closes or frame.state not in ("first", "comma"):
+                self._fail(char)
+            self._stack.pop()
+            self._end_value(frame)
+            return
+        if char == ":":
+            if frame.kind != "{" or frame.state != "colon":
+                self._fail(char)
+            frame.state = "value"
+            return
+        if char == ",":
+            if frame.state != "comma":
+                self._fail(char)
+            frame.state = "key" if frame.kind == "{" else "value"
+            return
+        if char in _LITERAL_CHARS and self._expects_value(frame):
+            self._literal.append(char)
+            return
+        self._fail(char)
+
+    @staticmethod
+    def _expects_value(frame: _Frame) -> bool:
+        if frame.kind == "{":
+            return frame.state == "value"
+        return frame.state in ("first", "value")
+
+    def _end_string(self, value: str) -> None:
+        frame = self._stack[-1]
+        if frame.kind == "{" and frame.state in ("first", "key"):
+            frame.state = "colon"
+            self._last_key = value
+            return
+        self._end_value(None)
+
+    def _end_literal(self) -> None:
+        literal = "".join(self._literal)
+        self._literal = []
+        try:
+            json.loads(literal)
+        except json.JSONDecodeError:
+            raise JsonStreamError(f"invalid literal {literal!r}") from None
+        self._end_value(None)
+
+    def _end_value(self, closed: _Frame | None) -> None:
+        if not self._stack:
+            self.done = True
+            return
+        parent = self._stack[-1]
+        parent.state = "comma"
+        if (
+            closed is not None
+            and closed.kind == "{"
+            and parent.kind == "["
+            and parent.key == "themes"
+            and len(self._stack) == 2
+        ):
+            self.themes += 1
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+
+
+class LLMCache:
+    """Persistent cache of model completions shared across runs and dates.
+
+    Keys hash the model, the prompt template version and the prompt text, so
+    any change to the inputs misses. Entries created more than
+    ``max_age_days`` ago are ignored, entries unused for that long are
+    removed, and past ``max_bytes`` the least recently used go first.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_age_days: float = 30.0,
+        evict_every: int = 50,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.evict()
+
+    @staticmethod
+    def key(model: str, template_version: str, prompt: str) -> str:
+        raw = json.dumps([model, template_version, prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+            created = datetime.fromisoformat(entry["created_at"])
+        except (OSError, ValueError, KeyError):
+            return None
+        if (datetime.utcnow() - created).total_seconds() > self.max_age:
+            return None
+        return entry
+
+    def peek(self, key: str) -> str | None:
+        """The cached text for ``key`` without counting a hit or a use."""
+        entry = self._load(key)
+        return entry["text"] if entry else None
+
+    def get(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        entry = self._load(key)
+        if entry is not None:
+            try:
+                os.utime(self._path(key))  # mtime tracks last use for LRU eviction
+            except OSError:
+                entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry["text"], entry["payload"]
+
+    def put(self, key: str, model: str, text: str, payload: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "model": model,
+            "created_at": datetime.utcnow().isoformat(),
+            "text": text,
+            "payload": payload,
+        }
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        temp_path.replace(path)
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def discard(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        if not self.root.exists():
+            return 0
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        removed = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Evicted {} LLM cache entries", removed)
+        return removed
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Callable, TypeVar
+
+from loguru import logger
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    InternalServerError,
+    RateLimitError,
+)
+
+from .ratelimit import TokenBucket, backoff_delay, parse_retry_after
+
+
+T = TypeVar("T")
+
+# APITimeoutError subclasses APIConnectionError, so timeouts are covered too.
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    if not isinstance(exc, APIStatusError):
+        return None
+    headers = exc.response.headers
+    millis = headers.get("retry-after-ms")
+    if millis:
+        try:
+            return max(0.0, float(millis) / 1000)
+        except ValueError:
+            pass
+    return parse_retry_after(headers.get("retry-after"))
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    retries: int = 0
+    queued_seconds: float = 0.0
+    max_queued_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(
+        self,
+        *,
+        requests: int = 0,
+        retries: int = 0,
+        queued: float = 0.0,
+        backoff: float = 0.0,
+    ) -> None:
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.queued_seconds += queued
+            self.max_queued_seconds = max(self.max_queued_seconds, queued)
+            self.backoff_seconds += backoff
+
+
+class LLMScheduler:
+    """Paces model calls against per-model request and token budgets.
+
+    Each model gets a requests-per-minute and a tokens-per-minute bucket
+    (``rpm``/``tpm`` of zero or less disables that budget). Calls wait for
+    both buckets, then for a free slot, and that wait is reported as queue
+    time. Rate limits, timeouts, connection errors and 5xx responses are
+    retried up to ``max_retries`` times with full-jitter backoff, honouring
+    ``retry-after`` when the server sends it.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: float = 0,
+        tpm: float = 0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+    ) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.stats = SchedulerStats()
+        self._buckets: dict[str, tuple[TokenBucket, TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _buckets_for(self, model: str) -> tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            if model not in self._buckets:
+                self._buckets[model] = (
+                    TokenBucket(rate=self.rpm / 60, capacity=self.rpm),
+                    TokenBucket(rate=self.tpm / 60, capacity=self.tpm),
+                )
+            return self._buckets[model]
+
+    def run(
+        self,
+        model: str,
+        tokens: int,
+        call: Callable[[], T],
+        *,
+        slots: threading.Semaphore | None = None,
+    ) -> T:
+        requests_bucket, tokens_bucket = self._buckets_for(model)
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            delay = max(
+                requests_bucket.reserve(),
+                tokens_bucket.reserve(min(tokens, tokens_bucket.capacity)),
+            )
+            if delay > 0:
+                time.sleep(delay)
+            with slots if slots is not None else nullcontext():
+                queued = time.monotonic() - queued_at
+                self.stats.record(requests=1, queued=queued)
+                if queued >= 1.0:
+                    logger.debug("Model {} call queued for {:.1f}s", model, queued)
+                try:
+                    return call()
+                except RETRYABLE_ERRORS as exc:
+                    if attempt >= self.max_retries:
+                        raise
+                    reason = exc
+                    retry_after = _retry_after(exc)
+            delay = backoff_delay(
+                attempt,
+                base=self.backoff_base,
+                cap=self.backoff_cap,
+                retry_after=retry_after,
+            )
+            attempt += 1
+            logger.warning(
+                "Model {} call failed ({}), retry {}/{} in {:.1f}s",
+                model,
+                type(reason).__name__,
+                attempt,
+                self.max_retries,
+                delay,
+            )
+            self.stats.record(retries=1, backoff=delay)
+            time.sleep(delay)
@@ -2,24 +2,44 @@ from __future__ import annotations
 
 import argparse
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timedelta
-import math
+from pathlib import Path
+import threading
 from typing import Any
 
 from dotenv import load_dotenv
 from loguru import logger
 from openai import OpenAI
 
+from .accounting import Ledger, format_report, load_ledger, parse_prices
 from .arxiv_client import fetch_papers
-from .config import AppConfig, parse_target_date
+from .batch import summarize_papers_batch
+from .capabilities import CapabilityRegistry
+from .compaction import CompactionPolicy
+from .config import AppConfig, ProviderConfig, parse_target_date
 from .emailer import send_email
-from .models import Paper, SummaryChunk
+from .hedging import Hedger
+from .http_cache import HttpCache
+from .llm_cache import LLMCache
+from .llm_scheduler import LLMScheduler
+from .models import Paper, SummaryChunk, canonical_id
+from .oai_harvester import harvest_papers
+from .providers import ProviderPool
+from .ratelimit import TokenBucket
 from .storage import (
+    advance_watermarks,
+    batch_input_path,
     build_seen_set,
     has_summary_for_date,
     load_summary_chunks,
     load_state,
+    load_batch_job,
+    load_chunk_plan,
+    load_extractive_summary,
     load_overall_summary,
+    load_watermarks,
     migrate_legacy_data,
     read_raw_papers,
     save_raw_papers,
@@ -27,38 +47,272 @@ from .storage import (
     save_overall_response,
     save_state,
     save_summary_chunk,
+    save_batch_job,
+    save_chunk_plan,
+    save_extractive_summary,
     save_overall_summary,
     update_state_with_papers,
 )
-from .summarizer import summarize_overall, summarize_papers_stream
+from .summarizer import (
+    LLMResources,
+    plan_chunks,
+    summarize_overall,
+    summarize_papers_stream,
+)
+from .tokens import Tokenizer, get_tokenizer
 from .scheduler import run_daily
 
+
+@dataclass
+class RunContext:
+    """State shared by concurrent ``_run_once`` calls during a backfill.
+
+    All runs draw on one arXiv rate limiter, one cap on open arXiv
+    connections and one LLM concurrency budget.
+    State updates are collected here and merged once every run has finished.
+    """
+
+    arxiv_limiter: TokenBucket
+    arxiv_connections: threading.Semaphore
+    llm: LLMResources
+    http_cache: HttpCache | None
+    pending_state: list[tuple[date, list[Paper]]] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def defer_state(self, target_date: date, papers: list[Paper]) -> None:
+        with self.lock:
+            self.pending_state.append((target_date, papers))
+
+
+def _build_http_cache(config: AppConfig) -> HttpCache | None:
+    if not config.arxiv_http_cache:
+        return None
+    return HttpCache(Path(config.data_dir) / "cache" / "http")
+
+
+def _fetch(
+    config: AppConfig,
+    target_date: date,
+    context: RunContext | None = None,
+    watermarks: dict[str, datetime] | None = None,
+) -> list[Paper]:
+    limiter = context.arxiv_limiter if context else None
+    connections = context.arxiv_connections if context else None
+    cache = context.http_cache if context else _build_http_cache(config)
+    if config.arxiv_source == "oai":
+        return harvest_papers(
+            config.categories,
+            target_date,
+            target_date,
+            window_days=config.arxiv_oai_window_days,
+            concurrency=config.arxiv_concurrency,
+            min_interval=config.arxiv_min_interval,
+            max_retries=config.arxiv_max_retries,
+            limiter=limiter,
+            connections=connections,
+            oai_url=config.arxiv_oai_url,
+            cache=cache,
+            cache_horizon_days=config.arxiv_cache_horizon_days,
+        )
+    return fetch_papers(
+        config.categories,
+        target_date,
+        max_results=config.arxiv_max_results,
+        page_size=config.arxiv_page_size,
+        concurrency=config.arxiv_concurrency,
+        min_interval=config.arxiv_min_interval,
+        max_retries=config.arxiv_max_retries,
+        limiter=limiter,
+        connections=connections,
+        api_url=config.arxiv_api_url,
+        combined=config.arxiv_combined_query,
+        cache=cache,
+        cache_horizon_days=config.arxiv_cache_horizon_days,
+        watermarks=watermarks,
+    )
+
+
+def _build_llm_resources(
+    config: AppConfig,
+    slots: threading.Semaphore | None = None,
+) -> LLMResources:
+    cache = None
+    if config.openai_cache:
+        cache = LLMCache(
+            Path(config.data_dir) / "cache" / "llm",
+            max_bytes=config.openai_cache_max_mb * 1024 * 1024,
+            max_age_days=config.openai_cache_max_age_days,
+        )
+    capabilities = CapabilityRegistry(
+        config.data_dir, ttl_hours=config.openai_capability_ttl_hours
+    )
+    scheduler = LLMScheduler(
+        rpm=config.openai_rpm,
+        tpm=config.openai_tpm,
+        max_retries=config.openai_max_retries,
+    )
+    return LLMResources(
+        slots=slots,
+        cache=cache,
+        capabilities=capabilities,
+        scheduler=scheduler,
+        stream=config.openai_stream,
+        ledger=Ledger(config.data_dir, parse_prices(config.openai_prices)),
+        hedger=Hedger() if config.openai_hedge else None,
+        hedge_model=config.openai_hedge_model,
+        providers=_build_provider_pool(config),
+        structured=config.openai_structured_output,
+    )
+
+
+def _build_openai_client(
+    config: AppConfig, provider: ProviderConfig | None = None
+) -> OpenAI:
+    options: dict[str, Any] = {}
+    if config.openai_timeout_seconds > 0:
+        options["timeout"] = config.openai_timeout_seconds  # else the SDK default
+    # LLMScheduler owns retries, so the SDK's own retry loop is turned off.
+    return OpenAI(
+        api_key=provider.api_key if provider else config.openai_api_key,
+        base_url=provider.base_url if provider else config.openai_base_url,
+        max_retries=0,
+        **options,
+    )
+
+
+def _base_client(config: AppConfig, llm: LLMResources) -> OpenAI:
+    """Client for calls outside the provider pool (Batch API, embeddings).
+
+    A pool whose members carry their own keys needs no OPENAI_API_KEY, so
+    its first endpoint stands in for the base client then.
+    """
+    if llm.providers and not config.openai_api_key:
+        return llm.providers.endpoints[0].client
+    return _build_openai_client(config)
+
+
+def _build_provider_pool(config: AppConfig) -> ProviderPool | None:
+    if not config.openai_providers:
+        return None
+    pool = ProviderPool.from_configs(
+        config.openai_providers,
+        lambda provider: _build_openai_client(config, provider),
+    )
+    logger.info(
+        "Spreading model calls over {} endpoints: {}",
+        len(pool.endpoints),
+        ", ".join(
+            f"{e.name} (weight {e.weight:g}, {e.concurrency} slots)"
+            for e in pool.endpoints
+        ),
+    )
+    return pool
+
+
 def _resolve_target_date(value: date | None) -> date:
     return value or (date.today() - timedelta(days=1))
 
 
 def _load_papers_from_storage(config: AppConfig, target_date: date) -> list[Paper]:
     raw_items = read_raw_papers(config.data_dir, target_date)
-    papers: list[Paper] = []
-    for item in raw_items:
-        papers.append(
-            Paper(
-                paper_id=item["paper_id"],
-                title=item["title"],
-                summary=item["summary"],
-                authors=item["authors"],
-                link=item["link"],
-                category=item["category"],
-                published=datetime.fromisoformat(item["published"]),
-                updated=datetime.fromisoformat(item["updated"]),
+    return [Paper.from_dict(item) for item in raw_items]
+
+
+def _compaction_policy(config: AppConfig) -> CompactionPolicy:
+    return CompactionPolicy(
+        max_authors=config.openai_prompt_max_authors,
+        short_links=config.openai_prompt_short_links,
+        abstract_tokens=config.openai_prompt_abstract_tokens,
+    )
+
+
+def _plan_summary_chunks(
+    config: AppConfig,
+    target_date: date,
+    papers: list[Paper],
+    tokenizer: Tokenizer,
+    client: OpenAI,
+) -> list[list[Paper]]:
+    """Chunk ``papers``, reusing the plan saved for ``target_date`` if any.
+
+    Saved ``summary_partXX`` files are matched to chunks by index, and the
+    plan depends on the budget, chunk size, tokenizer and compaction, so a
+    resumed date keeps its original plan whatever those are now.
+    """
+    by_id = {paper.paper_id: paper for paper in papers}
+    plan = load_chunk_plan(config.data_dir, target_date)
+    planned = sorted(paper_id for chunk in plan or [] for paper_id in chunk)
+    if plan is not None and planned == sorted(by_id):
+        return [[by_id[paper_id] for paper_id in chunk] for chunk in plan]
+    chunks = _new_chunk_plan(config, papers, tokenizer, client)
+    save_chunk_plan(
+        config.data_dir,
+        target_date,
+        [[paper.paper_id for paper in chunk] for chunk in chunks],
+    )
+    return chunks
+
+
+def _planned_papers(
+    plan: list[list[str]] | None, papers: list[Paper]
+) -> list[Paper]:
+    """The papers a saved chunk plan was made for, in plan order.
+
+    The plan covers the papers left after the seen filter of the first run,
+    not every stored paper, so a resume has to summarize exactly those.
+    """
+    by_id = {paper.paper_id: paper for paper in papers}
+    planned = [paper_id for chunk in plan or [] for paper_id in chunk]
+    if not planned or any(paper_id not in by_id for paper_id in planned):
+        return papers
+    return [by_id[paper_id] for paper_id in planned]
+
+
+def _new_chunk_plan(
+    config: AppConfig,
+    papers: list[Paper],
+    tokenizer: Tokenizer,
+    client: OpenAI,
+) -> list[list[Paper]]:
+    if config.openai_chunk_clustering:
+        try:
+            from .clustering import cluster_chunks
+        except ImportError:
+            logger.warning("numpy is not installed. Falling back to sequential chunks.")
+        else:
+            embedding_client = client if config.openai_embedding_model else None
+            return cluster_chunks(
+                papers,
+                chunk_size=config.openai_chunk_max_papers,
+                token_budget=config.openai_chunk_token_budget,
+                tokenizer=tokenizer,
+                client=embedding_client,
+                embedding_model=config.openai_embedding_model,
+                compaction=_compaction_policy(config),
             )
-        )
-    return papers
+    return plan_chunks(
+        papers,
+        chunk_size=config.openai_chunk_max_papers,
+        token_budget=config.openai_chunk_token_budget,
+        tokenizer=tokenizer,
+        compaction=_compaction_policy(config),
+    )
 
 
-def _run_once(config: AppConfig, target_date: date) -> None:
+def _run_once(
+    config: AppConfig,
+    target_date: date,
+    context: RunContext | None = None,
+) -> None:
+    llm = context.llm if context else _build_llm_resources(config)
     state = load_state(config.data_dir)
     seen_ids = build_seen_set(state, config.retention_days)
+    # Backfills ask for explicit days, so watermarks only drive regular runs.
+    use_watermarks = (
+        config.arxiv_fetch_mode == "watermark"
+        and config.arxiv_source == "api"
+        and context is None
+    )
 
     stored_papers = _load_papers_from_storage(config, target_date)
     has_summary = has_summary_for_date(config.data_dir, target_date)
@@ -66,13 +320,24 @@ def _run_once(config: AppConfig, target_date: date) -> None:
         papers = stored_papers
         logger.info("Loaded {} papers from storage for {}", len(papers), target_date)
     else:
-        papers = fetch_papers(config.categories, target_date)
+        watermarks = load_watermarks(state) if use_watermarks else None
+        papers = _fetch(config, target_date, context, watermarks)
         save_raw_papers(config.data_dir, target_date, papers)
         logger.info("Fetched {} papers from arXiv", len(papers))
 
     existing_chunks = load_summary_chunks(config.data_dir, target_date)
-    chunk_size = 20
-    expected_chunks = math.ceil(len(papers) / chunk_size) if papers else 0
+    tokenizer = get_tokenizer(config.openai_chunk_model)
+    stored_plan = load_chunk_plan(config.data_dir, target_date)
+    expected_chunks = len(
+        stored_plan
+        or plan_chunks(
+            papers,
+            chunk_size=config.openai_chunk_max_papers,
+            token_budget=config.openai_chunk_token_budget,
+            tokenizer=tokenizer,
+            compaction=_compaction_policy(config),
+        )
+    )
 
     if stored_papers and (not has_summary or len(existing_chunks) < expected_chunks):
         logger.info(
@@ -81,16 +346,39 @@ def _run_once(config: AppConfig, target_date: date) -> None:
             expected_chunks,
             target_date,
         )
-        new_papers = papers
+        new_papers = _planned_papers(stored_plan, papers)
+    elif use_watermarks:
+        # lastUpdatedDate also returns new versions of papers already mailed.
+        seen_canonical = {canonical_id(paper_id) for paper_id in seen_ids}
+        new_papers = [
+            paper for paper in papers if paper.canonical_id not in seen_canonical
+        ]
     else:
         new_papers = [paper for paper in papers if paper.paper_id not in seen_ids]
 
     logger.info("New papers after dedupe: {}", len(new_papers))
 
-    save_state(
-        config.data_dir,
-        update_state_with_papers(state, target_date, new_papers),
-    )
+    if context:
+        context.defer_state(target_date, new_papers)
+    else:
+        state = update_state_with_papers(state, target_date, new_papers)
+        if use_watermarks and not stored_papers:
+            state = advance_watermarks(state, papers)
+        save_state(config.data_dir, state)
+
+    llm_configured = bool(config.openai_api_key or config.openai_providers)
+    extractive_summary = None
+    if new_papers and (not llm_configured or config.extractive_preview):
+        extractive_summary = _summarize_extractive(config, target_date, new_papers)
+        if extractive_summary and llm_configured:
+            _send_digest(
+                config,
+                target_date,
+                papers,
+                [],
+                extractive_summary,
+                subject=f"arXiv 每日论文速览 {target_date.isoformat()}",
+            )
 
     summaries: list[dict[str, Any]] = []
     if not new_papers:
@@ -100,42 +388,80 @@ def _run_once(config: AppConfig, target_date: date) -> None:
         logger.info("No new papers for {}. Reusing existing summaries.", target_date)
         for idx in sorted(existing_chunks):
             summaries.append(existing_chunks[idx])
-    else:
-        if not config.openai_api_key:
+    elif not llm_configured:
+        if not extractive_summary:
             logger.warning("OPENAI_API_KEY not configured. Skip summarization.")
             return
-
-        client = OpenAI(api_key=config.openai_api_key, base_url=config.openai_base_url)
-        summary_pairs = summarize_papers_stream(
-            client,
-            config.openai_chunk_model,
-            target_date,
-            new_papers,
-            chunk_size=chunk_size,
-            existing_chunks=existing_chunks,
-            on_response=lambda idx, payload: save_response_chunk(
-                config.data_dir, target_date, idx, payload
-            ),
+        logger.warning("OPENAI_API_KEY not configured. Using the extractive summary.")
+    else:
+        client = _base_client(config, llm)
+        chunks = _plan_summary_chunks(
+            config, target_date, new_papers, tokenizer, client
         )
 
-        for idx, summary in summary_pairs:
-            if idx not in existing_chunks:
-                save_summary_chunk(
-                    config.data_dir,
-                    SummaryChunk(
-                        date=target_date.isoformat(),
-                        chunk_index=idx,
-                        content=summary,
-                    ),
-                )
-            summaries.append(summary)
+        def on_response(idx: int, payload: dict[str, Any]) -> None:
+            save_response_chunk(config.data_dir, target_date, idx, payload)
+
+        def on_summary(idx: int, summary: dict[str, Any]) -> None:
+            save_summary_chunk(
+                config.data_dir,
+                SummaryChunk(
+                    date=target_date.isoformat(),
+                    chunk_index=idx,
+                    content=summary,
+                ),
+            )
+
+        if config.openai_batch:
+            summary_pairs = summarize_papers_batch(
+                client,
+                config.openai_chunk_model,
+                target_date,
+                new_papers,
+                input_path=batch_input_path(config.data_dir, target_date),
+                chunk_size=config.openai_chunk_max_papers,
+                token_budget=config.openai_chunk_token_budget,
+                tokenizer=tokenizer,
+                existing_chunks=existing_chunks,
+                job=load_batch_job(config.data_dir, target_date),
+                on_job=lambda job: save_batch_job(config.data_dir, target_date, job),
+                on_response=on_response,
+                on_summary=on_summary,
+                poll_interval=config.openai_batch_poll_seconds,
+                max_concurrency=config.openai_concurrency,
+                resources=llm,
+                chunks=chunks,
+                compaction=_compaction_policy(config),
+            )
+        else:
+            summary_pairs = summarize_papers_stream(
+                client,
+                config.openai_chunk_model,
+                target_date,
+                new_papers,
+                chunk_size=config.openai_chunk_max_papers,
+                token_budget=config.openai_chunk_token_budget,
+                tokenizer=tokenizer,
+                existing_chunks=existing_chunks,
+                on_response=on_response,
+                on_summary=on_summary,
+                max_concurrency=config.openai_concurrency,
+                resources=llm,
+                chunks=chunks,
+                compaction=_compaction_policy(config),
+            )
+        summaries.extend(summary for _, summary in summary_pairs)
 
     overall_summary = load_overall_summary(config.data_dir, target_date)
     if not overall_summary:
-        if not config.openai_api_key:
-            logger.warning("OPENAI_API_KEY not configured. Skip overall summary.")
+        if not llm_configured:
+            overall_summary = extractive_summary or load_extractive_summary(
+                config.data_dir, target_date
+            )
+            if not overall_summary:
+                logger.warning("OPENAI_API_KEY not configured. Skip overall summary.")
         else:
-            client = OpenAI(api_key=config.openai_api_key, base_url=config.openai_base_url)
+            client = _base_client(config, llm)
             overall_summary = summarize_overall(
                 client,
                 config.openai_overall_model,
@@ -144,12 +470,83 @@ def _run_once(config: AppConfig, target_date: date) -> None:
                 on_response=lambda payload: save_overall_response(
                     config.data_dir, target_date, payload
                 ),
+                token_budget=config.openai_overall_token_budget,
+                tokenizer=get_tokenizer(config.openai_overall_model),
+                max_concurrency=config.openai_concurrency,
+                resources=llm,
             )
             save_overall_summary(config.data_dir, target_date, overall_summary)
 
-    chunk_summaries = summaries
-    summaries = chunk_summaries
+    if llm.cache:
+        logger.info("LLM cache: {} hits, {} misses", llm.cache.hits, llm.cache.misses)
+    if llm.scheduler:
+        stats = llm.scheduler.stats
+        logger.info(
+            "LLM calls: {} requests, {} retries, {:.1f}s queued (max {:.1f}s), "
+            "{:.1f}s backing off",
+            stats.requests,
+            stats.retries,
+            stats.queued_seconds,
+            stats.max_queued_seconds,
+            stats.backoff_seconds,
+        )
+    if llm.hedger:
+        hedge_stats = llm.hedger.stats
+        logger.info(
+            "Hedging: {} of {} chunk calls hedged, backup answered first {} times",
+            hedge_stats.hedged,
+            hedge_stats.calls,
+            hedge_stats.backup_wins,
+        )
+    if llm.providers:
+        for endpoint in llm.providers.endpoints:
+            logger.info(
+                "Endpoint {}: {} requests, {} failed",
+                endpoint.name,
+                endpoint.requests,
+                endpoint.errors,
+            )
+
+    _send_digest(
+        config,
+        target_date,
+        papers,
+        summaries,
+        overall_summary,
+        subject=f"arXiv 每日论文摘要 {target_date.isoformat()}",
+    )
+
 
+def _summarize_extractive(
+    config: AppConfig,
+    target_date: date,
+    papers: list[Paper],
+) -> dict[str, Any] | None:
+    try:
+        from .extractive import summarize_extractive
+    except ImportError:
+        logger.warning("numpy is not installed. Skip extractive summary.")
+        return None
+    summary = summarize_extractive(papers)
+    save_extractive_summary(config.data_dir, target_date, summary)
+    logger.info(
+        "Extractive summary for {}: {} themes from {} papers",
+        target_date,
+        len(summary.get("themes", [])),
+        len(papers),
+    )
+    return summary
+
+
+def _send_digest(
+    config: AppConfig,
+    target_date: date,
+    papers: list[Paper],
+    summaries: list[dict[str, Any]],
+    overall_summary: dict[str, Any] | None,
+    *,
+    subject: str,
+) -> None:
     if (
         config.smtp_host
         and config.smtp_user
@@ -157,7 +554,7 @@ def _run_once(config: AppConfig, target_date: date) -> None:
         and config.smtp_to
     ):
         category_counts = dict(
-            sorted(Counter(paper.category for paper in papers).items())
+            sorted(Counter(paper.primary_category for paper in papers).items())
         )
         send_email(
             host=config.smtp_host,
@@ -166,8 +563,8 @@ def _run_once(config: AppConfig, target_date: date) -> None:
             password=config.smtp_password,
             sender=config.smtp_from or config.smtp_user,
             recipients=config.smtp_to,
-            subject=f"arXiv 每日论文摘要 {target_date.isoformat()}",
-            summaries=chunk_summaries,
+            subject=subject,
+            summaries=summaries,
             overall_summary=overall_summary,
             category_counts=category_counts,
             date_str=target_date.isoformat(),
@@ -177,11 +574,85 @@ def _run_once(config: AppConfig, target_date: date) -> None:
         logger.warning("SMTP not configured or recipients missing. Skip email.")
 
 
+def _run_backfill(
+    config: AppConfig,
+    date_from: date,
+    date_to: date,
+    workers: int,
+) -> None:
+    days = [
+        date_from + timedelta(days=offset)
+        for offset in range((date_to - date_from).days + 1)
+    ]
+    min_interval = config.arxiv_min_interval
+    context = RunContext(
+        arxiv_limiter=TokenBucket(rate=1.0 / min_interval if min_interval > 0 else 0.0),
+        arxiv_connections=threading.BoundedSemaphore(max(1, config.arxiv_concurrency)),
+        llm=_build_llm_resources(
+            config, threading.BoundedSemaphore(config.openai_concurrency)
+        ),
+        http_cache=_build_http_cache(config),
+    )
+    logger.info(
+        "Backfilling {} days from {} to {} with {} workers",
+        len(days),
+        date_from,
+        date_to,
+        workers,
+    )
+    failed: list[date] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_run_once, config, day, context): day for day in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Backfill failed for {}", day)
+                failed.append(day)
+
+    state = load_state(config.data_dir)
+    for day, papers in sorted(context.pending_state, key=lambda item: item[0]):
+        state = update_state_with_papers(state, day, papers)
+    save_state(config.data_dir, state)
+    logger.info(
+        "Backfill finished: {} succeeded, {} failed{}",
+        len(days) - len(failed),
+        len(failed),
+        f" ({', '.join(sorted(day.isoformat() for day in failed))})" if failed else "",
+    )
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Daily arXiv digest crawler.")
     parser.add_argument("--log-path", help="Log file path.")
     parser.add_argument("--date", help="Target date in YYYY-MM-DD.")
     parser.add_argument("--once", action="store_true", help="Run once and exit.")
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        help="Backfill start date in YYYY-MM-DD (inclusive).",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        help="Backfill end date in YYYY-MM-DD (inclusive, default: yesterday).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of dates processed in parallel during a backfill.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Summarize chunks through the OpenAI Batch API (OPENAI_BATCH=1).",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print token usage, cost and latency from the ledger and exit.",
+    )
     parser.add_argument(
         "--env-file",
         help="Load environment variables from a specific .env file.",
@@ -207,6 +678,8 @@ def main() -> None:
         load_dotenv(args.env_file)
 
     config = AppConfig.from_env()
+    if args.batch:
+        config = replace(config, openai_batch=True)
 
     def task() -> None:
         target_date = _resolve_target_date(parse_target_date(args.date))
@@ -218,6 +691,25 @@ def main() -> None:
         logger.info("Migrated {} legacy files.", len(moved))
         return
 
+    if args.report:
+        report_from = parse_target_date(args.date_from)
+        report_to = parse_target_date(args.date_to)
+        print(format_report(load_ledger(config.data_dir, report_from, report_to)))
+        return
+
+    if args.date_from:
+        date_from = date.fromisoformat(args.date_from)
+        date_to = _resolve_target_date(parse_target_date(args.date_to))
+        if date_to < date_from:
+            parser.error("--to must not be earlier than --from")
+        _run_backfill(
+            config,
+            date_from,
+            date_to,
+            args.workers or config.backfill_workers,
+        )
+        return
+
     if args.once:
         task()
         return
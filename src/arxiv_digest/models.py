@@ -2,9 +2,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass, asdict
 from datetime import datetime
+import re
 from typing import Any
 
 
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+
+
+def canonical_id(paper_id: str) -> str:
+    """``http://arxiv.org/abs/2401.01234v2`` -> ``2401.01234``."""
+    return _VERSION_SUFFIX.sub("", paper_id.rsplit("/abs/", 1)[-1])
+
+
 @dataclass(frozen=True)
 class Paper:
     paper_id: str
@@ -12,16 +21,41 @@ class Paper:
     summary: str
     authors: list[str]
     link: str
-    category: str
+    categories: list[str]
     published: datetime
     updated: datetime
 
+    @property
+    def canonical_id(self) -> str:
+        return canonical_id(self.paper_id)
+
+    @property
+    def primary_category(self) -> str:
+        return self.categories[0] if self.categories else ""
+
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
         data["published"] = self.published.isoformat()
         data["updated"] = self.updated.isoformat()
         return data
 
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "Paper":
+        categories = data.get("categories")
+        if categories is None:
+            # papers.jsonl written before cross-list merging had one category.
+            categories = [data["category"]] if data.get("category") else []
+        return Paper(
+            paper_id=data["paper_id"],
+            title=data["title"],
+            summary=data["summary"],
+            authors=data["authors"],
+            link=data["link"],
+            categories=list(categories),
+            published=datetime.fromisoformat(data["published"]),
+            updated=datetime.fromisoformat(data["updated"]),
+        )
+
 
 @dataclass(frozen=True)
 class SummaryChunk:
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+import threading
+from typing import Iterable, Sequence
+from urllib.parse import urlencode
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from loguru import logger
+
+from .arxiv_client import ArxivHttpClient, dedupe_papers
+from .atom import match_categories
+from .http_cache import HttpCache
+from .models import Paper
+from .ratelimit import TokenBucket
+
+
+OAI_PMH_URL = "https://oaipmh.arxiv.org/oai"
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+ARXIV_META_NS = "{http://arxiv.org/OAI/arXiv/}"
+# Archives published as top-level OAI sets; everything else lives under physics.
+TOP_LEVEL_SETS = frozenset({"cs", "econ", "eess", "math", "q-bio", "q-fin", "stat"})
+
+
+def _oai_set(category: str) -> str:
+    archive = category.split(".", 1)[0]
+    return archive if archive in TOP_LEVEL_SETS else f"physics:{archive}"
+
+
+def _text(elem: Element | None) -> str:
+    if elem is None or elem.text is None:
+        return ""
+    return " ".join(elem.text.split())
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+class OaiStreamParser:
+    """Incremental parser for ``ListRecords`` responses in the ``arXiv`` format.
+
+    Records are converted to ``Paper`` objects as they close, tagged with the
+    ``wanted`` categories they belong to; others are skipped. After the body
+    is consumed, ``resumption_token`` holds the token for the next request.
+    """
+
+    def __init__(self, wanted: Sequence[str]) -> None:
+        self.wanted = list(wanted)
+        self.resumption_token: str | None = None
+        self.error: tuple[str, str] | None = None
+        self._parser = XMLPullParser(events=("end",))
+
+    def feed(self, data: bytes) -> list[Paper]:
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[Paper]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[Paper]:
+        papers: list[Paper] = []
+        for _, elem in self._parser.read_events():
+            if elem.tag == f"{OAI_NS}record":
+                paper = self._to_paper(elem)
+                if paper is not None:
+                    papers.append(paper)
+                elem.clear()
+            elif elem.tag == f"{OAI_NS}resumptionToken":
+                self.resumption_token = _text(elem) or None
+            elif elem.tag == f"{OAI_NS}error":
+                self.error = (elem.get("code", ""), _text(elem))
+        return papers
+
+    def _to_paper(self, record: Element) -> Paper | None:
+        header = record.find(f"{OAI_NS}header")
+        if header is not None and header.get("status") == "deleted":
+            return None
+        meta = record.find(f"{OAI_NS}metadata/{ARXIV_META_NS}arXiv")
+        if meta is None:
+            return None
+        terms = _text(meta.find(f"{ARXIV_META_NS}categories")).split()
+        categories = match_categories(terms, self.wanted)
+        if not categories:
+            return None
+
+        arxiv_id = _text(meta.find(f"{ARXIV_META_NS}id"))
+        authors = []
+        for author in meta.iter(f"{ARXIV_META_NS}author"):
+            parts = [
+                _text(author.find(f"{ARXIV_META_NS}forenames")),
+                _text(author.find(f"{ARXIV_META_NS}keyname")),
+                _text(author.find(f"{ARXIV_META_NS}suffix")),
+            ]
+            authors.append(" ".join(part for part in parts if part))
+        created = _parse_date(_text(meta.find(f"{ARXIV_META_NS}created")))
+        updated_text = _text(meta.find(f"{ARXIV_META_NS}updated"))
+        return Paper(
+            paper_id=f"http://arxiv.org/abs/{arxiv_id}",
+            title=_text(meta.find(f"{ARXIV_META_NS}title")),
+            summary=_text(meta.find(f"{ARXIV_META_NS}abstract")),
+            authors=authors,
+            link=f"http://arxiv.org/abs/{arxiv_id}",
+            categories=categories,
+            published=created,
+            updated=_parse_date(updated_text) if updated_text else created,
+        )
+
+
+async def _harvest_set(
+    client: ArxivHttpClient,
+    oai_url: str,
+    set_spec: str,
+    window_from: date,
+    window_until: date,
+    wanted: Sequence[str],
+) -> list[Paper]:
+    params: dict[str, str] = {
+        "verb": "ListRecords",
+        "metadataPrefix": "arXiv",
+        "set": set_spec,
+        "from": window_from.isoformat(),
+        "until": window_until.isoformat(),
+    }
+    papers: list[Paper] = []
+    pages = 0
+    while True:
+        parser, page = await client.parse(
+            f"{oai_url}?{urlencode(params)}", lambda: OaiStreamParser(wanted)
+        )
+        papers.extend(page)
+        pages += 1
+        if parser.error and parser.error[0] != "noRecordsMatch":
+            raise RuntimeError(f"OAI-PMH error {parser.error[0]}: {parser.error[1]}")
+        if not parser.resumption_token:
+            break
+        params = {"verb": "ListRecords", "resumptionToken": parser.resumption_token}
+    logger.info(
+        "Harvested {} records from set {} ({} to {}, {} pages)",
+        len(papers),
+        set_spec,
+        window_from,
+        window_until,
+        pages,
+    )
+    return papers
+
+
+async def harvest_papers_async(
+    categories: Iterable[str],
+    date_from: date,
+    date_until: date,
+    timeout: float = 60.0,
+    *,
+    window_days: int = 1,
+    announce_slack_days: int = 3,
+    concurrency: int = 1,
+    min_interval: float = 3.0,
+    max_retries: int = 5,
+    limiter: TokenBucket | None = None,
+    connections: threading.Semaphore | None = None,
+    oai_url: str = OAI_PMH_URL,
+    cache: HttpCache | None = None,
+    cache_horizon_days: int = 7,
+) -> list[Paper]:
+    """Harvest papers submitted between ``date_from`` and ``date_until``.
+
+    OAI-PMH datestamps follow announcement, not submission, so the harvest
+    window extends ``announce_slack_days`` past ``date_until`` and records
+    are then filtered on their creation date.
+    """
+    categories = list(categories)
+    set_specs = list(dict.fromkeys(_oai_set(category) for category in categories))
+    harvest_until = date_until + timedelta(days=announce_slack_days)
+    windows: list[tuple[date, date]] = []
+    window_start = date_from
+    while window_start <= harvest_until:
+        window_end = min(
+            window_start + timedelta(days=max(1, window_days) - 1), harvest_until
+        )
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+
+    immutable = (date.today() - harvest_until).days > cache_horizon_days
+    # OAI-PMH pages are chained by resumption tokens, so requests stay sequential
+    # within a set while windows and sets run side by side.
+    async with ArxivHttpClient(
+        timeout=timeout,
+        concurrency=concurrency,
+        min_interval=min_interval,
+        limiter=limiter,
+        connections=connections,
+        max_retries=max_retries,
+        cache=cache,
+        cache_immutable=immutable,
+    ) as client:
+        batches = await asyncio.gather(
+            *(
+                _harvest_set(client, oai_url, set_spec, start, end, categories)
+                for set_spec in set_specs
+                for start, end in windows
+            )
+        )
+
+    papers = [
+        paper
+        for batch in batches
+        for paper in batch
+        if date_from <= paper.published.date() <= date_until
+    ]
+    by_category: dict[str, list[Paper]] = {category: [] for category in categories}
+    for paper in dedupe_papers(papers):
+        by_category[paper.primary_category].append(paper)
+    return [paper for category in categories for paper in by_category[category]]
+
+
+def harvest_papers(
+    categories: Iterable[str],
+    date_from: date,
+    date_until: date,
+    timeout: float = 60.0,
+    *,
+    window_days: int = 1,
+    announce_slack_days: int = 3,
+    concurrency: int = 1,
+    min_interval: float = 3.0,
+    max_retries: int = 5,
+    limiter: TokenBucket | None = None,
+    connections: threading.Semaphore | None = None,
+    oai_url: str = OAI_PMH_URL,
+    cache: HttpCache | None = None,
+    cache_horizon_days: int = 7,
+) -> list[Paper]:
+    return asyncio.run(
+        harvest_papers_async(
+            categories,
+            date_from,
+            date_until,
+            timeout,
+            window_days=window_days,
+            announce_slack_days=announce_slack_days,
+            concurrency=concurrency,
+            min_interval=min_interval,
+            max_retries=max_retries,
+            limiter=limiter,
+            connections=connections,
+            oai_url=oai_url,
+            cache=cache,
+            cache_horizon_days=cache_horizon_days,
+        )
+    )
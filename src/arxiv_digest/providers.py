@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, TypeVar
+
+from loguru import logger
+from openai import OpenAI
+
+from .config import ProviderConfig
+from .llm_scheduler import RETRYABLE_ERRORS, _retry_after
+
+
+T = TypeVar("T")
+
+
+class Endpoint:
+    """One OpenAI-compatible gateway with its own concurrency cap and health."""
+
+    def __init__(self, config: ProviderConfig, client: OpenAI) -> None:
+        self.name = config.name
+        self.weight = max(config.weight, 0.01)
+        self.concurrency = max(config.concurrency, 1)
+        self.client = client
+        self.in_flight = 0
+        self.failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def healthy(self, now: float) -> bool:
+        return self.cooldown_until <= now
+
+    def load(self) -> float:
+        return (self.in_flight + 1) / self.weight
+
+
+class ProviderPool:
+    """Spreads model calls over several endpoints and fails over between them.
+
+    Each call goes to the healthy endpoint with the lowest in-flight count
+    relative to its weight, waiting while every healthy endpoint is at its
+    concurrency cap. A rate limit, timeout, connection error or 5xx puts the
+    endpoint in a cooldown (``retry-after`` or an exponential delay) and the
+    call moves on to another healthy endpoint; when none is left the error
+    is raised so ``LLMScheduler`` can back off and retry.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        *,
+        cooldown_base: float = 5.0,
+        cooldown_cap: float = 300.0,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("ProviderPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.cooldown_base = cooldown_base
+        self.cooldown_cap = cooldown_cap
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_configs(
+        cls,
+        providers: list[ProviderConfig],
+        build_client: Callable[[ProviderConfig], OpenAI],
+    ) -> ProviderPool:
+        return cls([Endpoint(config, build_client(config)) for config in providers])
+
+    @property
+    def capacity(self) -> int:
+        return sum(endpoint.concurrency for endpoint in self.endpoints)
+
+    def call(self, request: Callable[[OpenAI], T]) -> T:
+        tried: set[str] = set()
+        while True:
+            endpoint = self._acquire(tried)
+            try:
+                result = request(endpoint.client)
+            except RETRYABLE_ERRORS as exc:
+                self._release(endpoint, exc)
+                tried.add(endpoint.name)
+                if not self._has_alternative(tried):
+                    raise
+                logger.warning(
+                    "Endpoint {} failed ({}), failing over", endpoint.name, exc
+                )
+                continue
+            except BaseException:
+                self._release(endpoint)
+                raise
+            self._release(endpoint)
+            return result
+
+    def _acquire(self, tried: set[str]) -> Endpoint:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                untried = [e for e in self.endpoints if e.name not in tried]
+                candidates = untried or self.endpoints
+                healthy = [e for e in candidates if e.healthy(now)]
+                # With every candidate cooling down, use the one that recovers
+                # first rather than stalling; the scheduler handles backoff.
+                pool = healthy or [min(candidates, key=lambda e: e.cooldown_until)]
+                free = [e for e in pool if e.in_flight < e.concurrency]
+                if free:
+                    endpoint = min(free, key=Endpoint.load)
+                    endpoint.in_flight += 1
+                    endpoint.requests += 1
+                    return endpoint
+                self._cond.wait(timeout=1.0)
+
+    def _release(self, endpoint: Endpoint, error: BaseException | None = None) -> None:
+        with self._cond:
+            endpoint.in_flight -= 1
+            if error is None:
+                endpoint.failures = 0
+                endpoint.cooldown_until = 0.0
+            else:
+                endpoint.errors += 1
+                endpoint.failures += 1
+                cooldown = _retry_after(error)
+                if cooldown is None:
+                    cooldown = min(
+                        self.cooldown_cap,
+                        self.cooldown_base * 2 ** (endpoint.failures - 1),
+                    )
+                endpoint.cooldown_until = time.monotonic() + cooldown
+            self._cond.notify_all()
+
+    def _has_alternative(self, tried: set[str]) -> bool:
+        now = time.monotonic()
+        with self._cond:
+            return any(e.healthy(now) for e in self.endpoints if e.name not in tried)
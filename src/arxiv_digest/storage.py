@@ -10,6 +10,7 @@ from .models import Paper, SummaryChunk
 
 
 STATE_FILE = "state.json"
+CAPABILITIES_FILE = "capabilities.json"
 DATE_DIR_FORMAT = "%Y-%m-%d"
 LEGACY_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
 
@@ -37,6 +38,22 @@ def save_state(data_dir: str, state: dict[str, Any]) -> None:
     _atomic_write(state_dir / STATE_FILE, json.dumps(state, ensure_ascii=False, indent=2))
 
 
+def load_capabilities(data_dir: str) -> dict[str, Any]:
+    path = Path(data_dir) / "state" / CAPABILITIES_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_capabilities(data_dir: str, capabilities: dict[str, Any]) -> None:
+    state_dir = Path(data_dir) / "state"
+    _ensure_dir(state_dir)
+    _atomic_write(
+        state_dir / CAPABILITIES_FILE,
+        json.dumps(capabilities, ensure_ascii=False, indent=2),
+    )
+
+
 def build_seen_set(state: dict[str, Any], retention_days: int) -> set[str]:
     seen_by_date = state.get("seen_by_date", {})
     cutoff = date.today() - timedelta(days=retention_days)
@@ -60,11 +77,36 @@ def update_state_with_papers(
     for paper in papers:
         seen_by_date[day_key].append(paper.paper_id)
     return {
+        **state,
         "seen_by_date": seen_by_date,
         "last_run_date": datetime.utcnow().isoformat(),
     }
 
 
+def load_watermarks(state: dict[str, Any]) -> dict[str, datetime]:
+    return {
+        category: datetime.fromisoformat(value)
+        for category, value in state.get("watermarks", {}).items()
+    }
+
+
+def advance_watermarks(
+    state: dict[str, Any],
+    papers: Iterable[Paper],
+) -> dict[str, Any]:
+    watermarks = load_watermarks(state)
+    for paper in papers:
+        for category in paper.categories:
+            if category not in watermarks or paper.updated > watermarks[category]:
+                watermarks[category] = paper.updated
+    return {
+        **state,
+        "watermarks": {
+            category: value.isoformat() for category, value in watermarks.items()
+        },
+    }
+
+
 def _date_dir(data_dir: str, target_date: date) -> Path:
     return Path(data_dir) / target_date.strftime(DATE_DIR_FORMAT)
 
@@ -172,6 +214,34 @@ def load_overall_summary(
     return payload.get("content", {})
 
 
+def save_extractive_summary(
+    data_dir: str,
+    target_date: date,
+    summary: dict[str, Any],
+) -> Path:
+    summaries_dir = _date_dir(data_dir, target_date) / "summaries"
+    _ensure_dir(summaries_dir)
+    path = summaries_dir / "summary_extractive.json"
+    payload = {
+        "date": target_date.isoformat(),
+        "type": "extractive",
+        "content": summary,
+    }
+    _atomic_write(path, json.dumps(payload, ensure_ascii=False, indent=2))
+    return path
+
+
+def load_extractive_summary(
+    data_dir: str,
+    target_date: date,
+) -> dict[str, Any] | None:
+    path = _date_dir(data_dir, target_date) / "summaries" / "summary_extractive.json"
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return payload.get("content", {})
+
+
 def save_overall_response(
     data_dir: str,
     target_date: date,
@@ -184,6 +254,42 @@ def save_overall_response(
     return path
 
 
+def save_chunk_plan(data_dir: str, target_date: date, plan: list[list[str]]) -> Path:
+    date_dir = _date_dir(data_dir, target_date)
+    _ensure_dir(date_dir)
+    path = date_dir / "chunk_plan.json"
+    _atomic_write(path, json.dumps(plan, ensure_ascii=False, indent=2))
+    return path
+
+
+def load_chunk_plan(data_dir: str, target_date: date) -> list[list[str]] | None:
+    path = _date_dir(data_dir, target_date) / "chunk_plan.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def batch_input_path(data_dir: str, target_date: date) -> Path:
+    batch_dir = _date_dir(data_dir, target_date) / "batch"
+    _ensure_dir(batch_dir)
+    return batch_dir / "input.jsonl"
+
+
+def save_batch_job(data_dir: str, target_date: date, job: dict[str, Any]) -> Path:
+    batch_dir = _date_dir(data_dir, target_date) / "batch"
+    _ensure_dir(batch_dir)
+    path = batch_dir / "job.json"
+    _atomic_write(path, json.dumps(job, ensure_ascii=False, indent=2))
+    return path
+
+
+def load_batch_job(data_dir: str, target_date: date) -> dict[str, Any] | None:
+    path = _date_dir(data_dir, target_date) / "batch" / "job.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 def migrate_legacy_data(data_dir: str) -> list[tuple[Path, Path]]:
     base_dir = Path(data_dir)
     moved: list[tuple[Path, Path]] = []
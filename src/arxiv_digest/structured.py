@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+_STRING = {"type": "string"}
+
+_PAPER_SCHEMA = {
+    "type": "object",
+    "properties": {"title": _STRING, "link": _STRING},
+    "required": ["title", "link"],
+    "additionalProperties": False,
+}
+
+_THEME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": _STRING,
+        "description": _STRING,
+        "papers": {"type": "array", "items": _PAPER_SCHEMA},
+    },
+    "required": ["name", "description", "papers"],
+    "additionalProperties": False,
+}
+
+# Shared by chunk, merge and overall summaries; strict-mode compatible.
+SUMMARY_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "summary": _STRING,
+        "keywords": {"type": "array", "items": _STRING},
+        "themes": {"type": "array", "items": _THEME_SCHEMA},
+    },
+    "required": ["summary", "keywords", "themes"],
+    "additionalProperties": False,
+}
+
+SUMMARY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "digest_summary", "strict": True, "schema": SUMMARY_SCHEMA},
+}
+
+_TYPES = {"object": dict, "array": list, "string": str}
+
+
+def validate_summary(
+    value: Any,
+    schema: dict[str, Any] = SUMMARY_SCHEMA,
+    path: str = "$",
+) -> list[str]:
+    """Return the ways ``value`` violates ``schema``; empty when it conforms.
+
+    Only the keywords ``SUMMARY_SCHEMA`` uses are understood (``type``,
+    ``properties``, ``required`` and ``items``); unknown keys are tolerated
+    since they do no harm downstream.
+    """
+    expected = schema.get("type")
+    if expected and not isinstance(value, _TYPES[expected]):
+        return [f"{path} should be a {expected}, got {type(value).__name__}"]
+    errors: list[str] = []
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key} is missing")
+        for key, child in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate_summary(value[key], child, f"{path}.{key}"))
+    elif isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate_summary(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def build_repair_prompt(text_output: str, errors: list[str]) -> str:
+    """A short prompt asking to fix ``text_output`` without the source papers."""
+    lines = [
+        "以下 JSON 未通过校验，请修复后只返回修正后的 JSON 对象，不要添加额外文字，"
+        "不要改写或删减已有内容。",
+        "",
+        "问题：",
+        *(f"- {error}" for error in errors[:20]),
+        "",
+        "JSON Schema：",
+        json.dumps(SUMMARY_SCHEMA, ensure_ascii=False, separators=(",", ":")),
+        "",
+        "待修复内容：",
+        text_output,
+    ]
+    return "\n".join(lines)
@@ -1,14 +1,67 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import date
 import json
 import re
+import threading
+import time
 from typing import Any, Callable
 
 from loguru import logger
-from openai import OpenAI
+from openai import APIStatusError, OpenAI
 
+from .accounting import Ledger, usage_from_payload
+from .capabilities import CapabilityRegistry
+from .compaction import (
+    CompactionPolicy,
+    expand_links,
+    format_authors,
+    link_map,
+    short_link,
+    trim_abstract,
+)
+from .hedging import Hedger
+from .jsonstream import JsonStreamError, JsonStreamValidator
+from .llm_cache import LLMCache
+from .llm_scheduler import RETRYABLE_ERRORS, LLMScheduler
 from .models import Paper
+from .providers import ProviderPool
+from .structured import SUMMARY_RESPONSE_FORMAT, build_repair_prompt, validate_summary
+from .tokens import Tokenizer, estimate_tokens
+
+
+# Bump whenever the prompt templates change so cached completions are not reused.
+PROMPT_TEMPLATE_VERSION = "1"
+
+
+@dataclass
+class LLMResources:
+    """Resources shared by model calls across chunks and concurrent runs.
+
+    ``slots`` caps how many model requests are in flight at once,
+    ``cache`` answers repeated prompts without a network call and
+    ``capabilities`` remembers which APIs each endpoint supports,
+    ``scheduler`` paces calls per model and retries transient failures,
+    ``stream`` switches to streamed chat completions with JSON validation,
+    ``ledger`` records tokens, latency and cost of every call,
+    ``hedger`` duplicates slow chunk calls (to ``hedge_model`` if set),
+    ``providers`` spreads calls over several endpoints instead of ``client``
+    and ``structured`` requests schema-constrained JSON where the endpoint
+    supports it and repairs outputs that fail validation.
+    """
+
+    slots: threading.Semaphore | None = None
+    cache: LLMCache | None = None
+    capabilities: CapabilityRegistry | None = None
+    scheduler: LLMScheduler | None = None
+    stream: bool = False
+    ledger: Ledger | None = None
+    hedger: Hedger | None = None
+    hedge_model: str | None = None
+    providers: ProviderPool | None = None
+    structured: bool = False
 
 
 def _chunk(items: list[Paper], size: int) -> list[list[Paper]]:
@@ -22,7 +75,30 @@ def _extract_json(text: str) -> dict[str, Any]:
     return json.loads(match.group(0))
 
 
-def _build_prompt(target_date: date, papers: list[Paper]) -> str:
+def format_paper(
+    idx: int,
+    paper: Paper,
+    compaction: CompactionPolicy | None = None,
+) -> str:
+    if compaction is None:
+        compaction = CompactionPolicy()
+    abstract = trim_abstract(
+        paper.summary, compaction.abstract_tokens, title=paper.title
+    )
+    link = short_link(paper) if compaction.short_links else paper.link
+    return (
+        f"{idx}. [{', '.join(paper.categories)}] {paper.title}\n"
+        f"   Authors: {format_authors(paper.authors, compaction.max_authors)}\n"
+        f"   Abstract: {abstract}\n"
+        f"   Link: {link}\n"
+    )
+
+
+def build_prompt(
+    target_date: date,
+    papers: list[Paper],
+    compaction: CompactionPolicy | None = None,
+) -> str:
     lines = [
         "你是一名科研情报分析师，请基于以下 arXiv 论文列表输出结构化摘要。",
         "要求：",
@@ -31,18 +107,17 @@ def _build_prompt(target_date: date, papers: list[Paper]) -> str:
         "3) 提炼整体关键词（10-20 个）。",
         "4) 输出一个简要的整体总结（不超过 8 句）。",
         "5) 返回 JSON 对象，不要添加额外文字。",
+    ]
+    if compaction and compaction.short_links:
+        lines.append("6) 论文链接以 arXiv:ID 表示，JSON 中的 link 字段直接填写该 ID。")
+    lines += [
         "",
         f"日期：{target_date.isoformat()}",
         "",
         "论文列表：",
     ]
     for idx, paper in enumerate(papers, start=1):
-        lines.append(
-            f"{idx}. [{paper.category}] {paper.title}\n"
-            f"   Authors: {', '.join(paper.authors)}\n"
-            f"   Abstract: {paper.summary}\n"
-            f"   Link: {paper.link}\n"
-        )
+        lines.append(format_paper(idx, paper, compaction))
 
     lines.append(
         "JSON 结构示例："
@@ -52,12 +127,48 @@ def _build_prompt(target_date: date, papers: list[Paper]) -> str:
     return "\n".join(lines)
 
 
+def plan_chunks(
+    papers: list[Paper],
+    *,
+    chunk_size: int = 20,
+    token_budget: int | None = None,
+    tokenizer: Tokenizer | None = None,
+    compaction: CompactionPolicy | None = None,
+) -> list[list[Paper]]:
+    """Split ``papers`` into prompt chunks.
+
+    Without a ``token_budget`` this is fixed slicing by ``chunk_size``. With
+    one, papers are packed greedily in order until the estimated prompt
+    would exceed the budget, still capped at ``chunk_size`` papers. A paper
+    that alone exceeds the budget gets a chunk of its own.
+    """
+    if not token_budget:
+        return _chunk(papers, chunk_size)
+    count = tokenizer or estimate_tokens
+    overhead = count(build_prompt(date.today(), [], compaction))
+    chunks: list[list[Paper]] = []
+    current: list[Paper] = []
+    used = overhead
+    for paper in papers:
+        cost = count(format_paper(len(current) + 1, paper, compaction)) + 1
+        if current and (used + cost > token_budget or len(current) >= chunk_size):
+            chunks.append(current)
+            current, used = [], overhead
+        current.append(paper)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
 def summarize_papers(
     client: OpenAI,
     model: str,
     target_date: date,
     papers: list[Paper],
     chunk_size: int = 20,
+    token_budget: int | None = None,
+    resources: LLMResources | None = None,
 ) -> list[dict[str, Any]]:
     return [
         payload
@@ -67,11 +178,148 @@ def summarize_papers(
             target_date,
             papers,
             chunk_size=chunk_size,
+            token_budget=token_budget,
             existing_chunks=None,
+            resources=resources,
         )
     ]
 
 
+def _parse_summary(text_output: str) -> dict[str, Any]:
+    try:
+        if text_output.startswith("```json") and text_output.endswith("```"):
+            text_output = text_output[len("```json"):-len("```")]
+        return json.loads(text_output)
+    except json.JSONDecodeError:
+        logger.warning("Failed to parse direct JSON. Attempting fallback parsing.")
+        return _extract_json(text_output)
+
+
+# Repair prompts sent for an output that fails schema validation.
+STRUCTURED_REPAIRS = 1
+
+
+def _checked_summary(text_output: str) -> tuple[dict[str, Any] | None, list[str]]:
+    try:
+        summary = _parse_summary(text_output)
+    except ValueError as exc:  # includes json.JSONDecodeError
+        return None, [f"invalid JSON: {exc}"]
+    return summary, validate_summary(summary)
+
+
+def summary_validator(resources: LLMResources | None) -> Callable[[str], bool]:
+    """Accept completions that parse, and match the schema in structured mode."""
+    structured = bool(resources and resources.structured)
+
+    def validate(text_output: str) -> bool:
+        summary, errors = _checked_summary(text_output)
+        return summary is not None and not (structured and errors)
+
+    return validate
+
+
+def parse_or_repair(
+    client: OpenAI,
+    model: str,
+    text_output: str,
+    resources: LLMResources | None,
+    *,
+    target_date: date,
+    purpose: str,
+) -> dict[str, Any]:
+    """Parse a summary, repairing it from the broken text in structured mode.
+
+    Outside structured mode this is ``_parse_summary``. Otherwise the
+    output is validated against ``SUMMARY_SCHEMA`` and, when it fails, the
+    model gets a repair prompt holding only the broken JSON and the errors,
+    which costs a fraction of regenerating from the paper list.
+    """
+    if not (resources and resources.structured):
+        return _parse_summary(text_output)
+    summary, errors = _checked_summary(text_output)
+    for _ in range(STRUCTURED_REPAIRS):
+        if not errors:
+            break
+        logger.warning(
+            "Output of {} failed validation ({}), requesting a repair",
+            purpose,
+            "; ".join(errors[:3]),
+        )
+        repaired, _ = _call_model_with_fallback(
+            client,
+            model,
+            build_repair_prompt(text_output, errors),
+            resources,
+            target_date=target_date,
+            purpose=f"repair {purpose}",
+            validate=summary_validator(resources),
+        )
+        candidate, candidate_errors = _checked_summary(repaired)
+        if candidate is not None and (
+            summary is None or len(candidate_errors) <= len(errors)
+        ):
+            summary, errors, text_output = candidate, candidate_errors, repaired
+    if summary is None:
+        raise ValueError(f"Output of {purpose} is not valid JSON: {errors[0]}")
+    if errors:
+        logger.warning(
+            "Output of {} still has {} schema errors, keeping it", purpose, len(errors)
+        )
+    return summary
+
+
+def _summarize_chunk(
+    client: OpenAI,
+    model: str,
+    target_date: date,
+    chunk_index: int,
+    total_chunks: int,
+    chunk: list[Paper],
+    on_response: Callable[[int, dict[str, Any]], None] | None,
+    resources: LLMResources | None,
+    compaction: CompactionPolicy | None = None,
+    tokenizer: Tokenizer | None = None,
+) -> dict[str, Any]:
+    prompt = build_prompt(target_date, chunk, compaction)
+    logger.info(
+        "Summarizing chunk {}/{} ({} papers)", chunk_index, total_chunks, len(chunk)
+    )
+    if compaction and compaction.active:
+        count = tokenizer or estimate_tokens
+        full = count(build_prompt(target_date, chunk))
+        compact = count(prompt)
+        logger.info(
+            "Chunk {} prompt compacted from {} to {} tokens ({:.0%} saved)",
+            chunk_index,
+            full,
+            compact,
+            1 - compact / full if full else 0,
+        )
+    text_output, raw_payload = _call_model_with_fallback(
+        client,
+        model,
+        prompt,
+        resources,
+        target_date=target_date,
+        purpose=f"chunk {chunk_index}",
+        hedge=True,
+        validate=summary_validator(resources),
+    )
+    if on_response:
+        on_response(chunk_index, raw_payload)
+    summary = parse_or_repair(
+        client,
+        model,
+        text_output,
+        resources,
+        target_date=target_date,
+        purpose=f"chunk {chunk_index}",
+    )
+    if compaction and compaction.short_links:
+        summary = expand_links(summary, link_map(chunk))
+    return summary
+
+
 def summarize_papers_stream(
     client: OpenAI,
     model: str,
@@ -79,38 +327,83 @@ def summarize_papers_stream(
     papers: list[Paper],
     *,
     chunk_size: int = 20,
+    token_budget: int | None = None,
+    tokenizer: Tokenizer | None = None,
     existing_chunks: dict[int, dict[str, Any]] | None = None,
     on_response: Callable[[int, dict[str, Any]], None] | None = None,
+    on_summary: Callable[[int, dict[str, Any]], None] | None = None,
+    max_concurrency: int = 1,
+    resources: LLMResources | None = None,
+    chunks: list[list[Paper]] | None = None,
+    compaction: CompactionPolicy | None = None,
 ) -> list[tuple[int, dict[str, Any]]]:
+    """Summarize ``papers`` chunk by chunk, up to ``max_concurrency`` at a time.
+
+    Chunks come from ``plan_chunks``, so a ``token_budget`` packs papers by
+    estimated prompt size rather than a fixed count. A precomputed plan can
+    be passed as ``chunks`` instead. ``compaction`` shortens paper entries
+    in the prompts and logs the tokens saved per chunk.
+
+    ``on_response`` and ``on_summary`` fire for each new chunk as soon as it
+    completes; the returned list is always in chunk order. If a chunk fails,
+    the chunks already in flight still finish before the error is raised.
+    """
     if not papers:
         return []
 
-    outputs: list[tuple[int, dict[str, Any]]] = []
-    chunks = _chunk(papers, chunk_size)
+    if chunks is None:
+        chunks = plan_chunks(
+            papers,
+            chunk_size=chunk_size,
+            token_budget=token_budget,
+            tokenizer=tokenizer,
+            compaction=compaction,
+        )
     existing_chunks = existing_chunks or {}
-
-    for chunk_index, chunk in enumerate(chunks, start=1):
+    results: dict[int, dict[str, Any]] = {}
+    for chunk_index in range(1, len(chunks) + 1):
         if chunk_index in existing_chunks:
             logger.info("Using cached summary for chunk {}/{}", chunk_index, len(chunks))
-            outputs.append((chunk_index, existing_chunks[chunk_index]))
-            continue
-        prompt = _build_prompt(target_date, chunk)
-        logger.info(
-            "Summarizing chunk {}/{} ({} papers)", chunk_index, len(chunks), len(chunk)
-        )
-        text_output, raw_payload = _call_model_with_fallback(client, model, prompt)
-        if on_response:
-            on_response(chunk_index, raw_payload)
-        try:
-            if text_output.startswith("```json") and text_output.endswith("```"):
-                text_output = text_output[len("```json"):-len("```")]
-            payload = json.loads(text_output)
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse direct JSON. Attempting fallback parsing.")
-            payload = _extract_json(text_output)
-        outputs.append((chunk_index, payload))
+            results[chunk_index] = existing_chunks[chunk_index]
+
+    pending = [
+        (chunk_index, chunk)
+        for chunk_index, chunk in enumerate(chunks, start=1)
+        if chunk_index not in existing_chunks
+    ]
+    first_error: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = {
+            pool.submit(
+                _summarize_chunk,
+                client,
+                model,
+                target_date,
+                chunk_index,
+                len(chunks),
+                chunk,
+                on_response,
+                resources,
+                compaction,
+                tokenizer,
+            ): chunk_index
+            for chunk_index, chunk in pending
+        }
+        for future in as_completed(futures):
+            chunk_index = futures[future]
+            try:
+                payload = future.result()
+            except Exception as exc:
+                logger.error("Chunk {}/{} failed: {}", chunk_index, len(chunks), exc)
+                first_error = first_error or exc
+                continue
+            if on_summary:
+                on_summary(chunk_index, payload)
+            results[chunk_index] = payload
 
-    return outputs
+    if first_error is not None:
+        raise first_error
+    return sorted(results.items())
 
 
 def _build_overall_prompt(target_date: date, summaries: list[dict[str, Any]]) -> str:
@@ -135,6 +428,123 @@ def _build_overall_prompt(target_date: date, summaries: list[dict[str, Any]]) ->
     return "\n".join(lines)
 
 
+def _build_merge_prompt(target_date: date, summaries: list[dict[str, Any]]) -> str:
+    lines = [
+        "你是一名科研情报分析师，请将以下分块摘要合并为一份摘要，供后续整体总结使用。",
+        "要求：",
+        "1) 用中文输出。",
+        "2) 合并相近主题（3-8 个主题），保留每个主题的说明与代表论文链接。",
+        "3) 合并关键词（10-20 个），去除重复。",
+        "4) 输出一个简要的合并总结（不超过 8 句）。",
+        "5) 返回 JSON 对象，不要添加额外文字。",
+        "",
+        f"日期：{target_date.isoformat()}",
+        "",
+        "分块摘要 JSON：",
+        json.dumps(summaries, ensure_ascii=False),
+        "",
+        "JSON 结构示例："
+        '{"summary": "...", "keywords": ["..."], "themes": '
+        '[{"name": "...", "description": "...", "papers": [{"title": "...", "link": "..."}]}]}',
+    ]
+    return "\n".join(lines)
+
+
+def choose_fan_in(
+    target_date: date,
+    summaries: list[dict[str, Any]],
+    token_budget: int,
+    tokenizer: Tokenizer | None = None,
+) -> int:
+    """How many summaries one merge prompt can hold within ``token_budget``.
+
+    Sized by the largest summary so every group fits, and never below two
+    so each level strictly shrinks the list.
+    """
+    count = tokenizer or estimate_tokens
+    overhead = count(_build_merge_prompt(target_date, []))
+    largest = max(
+        count(json.dumps(summary, ensure_ascii=False)) + 1 for summary in summaries
+    )
+    return max(2, (token_budget - overhead) // max(1, largest))
+
+
+def _merge_group(
+    client: OpenAI,
+    model: str,
+    target_date: date,
+    level: int,
+    group_index: int,
+    group: list[dict[str, Any]],
+    resources: LLMResources | None,
+) -> dict[str, Any]:
+    if len(group) == 1:
+        return group[0]
+    logger.info(
+        "Merging level {} group {} ({} summaries)", level, group_index, len(group)
+    )
+    purpose = f"merge {level}.{group_index}"
+    text_output, _ = _call_model_with_fallback(
+        client,
+        model,
+        _build_merge_prompt(target_date, group),
+        resources,
+        target_date=target_date,
+        purpose=purpose,
+        validate=summary_validator(resources),
+    )
+    return parse_or_repair(
+        client, model, text_output, resources, target_date=target_date, purpose=purpose
+    )
+
+
+def reduce_summaries(
+    client: OpenAI,
+    model: str,
+    target_date: date,
+    summaries: list[dict[str, Any]],
+    *,
+    token_budget: int,
+    tokenizer: Tokenizer | None = None,
+    max_concurrency: int = 1,
+    resources: LLMResources | None = None,
+) -> list[dict[str, Any]]:
+    """Merge ``summaries`` level by level until the overall prompt fits.
+
+    Each level splits the list into groups sized by ``choose_fan_in`` and
+    merges the groups in parallel; order is preserved between levels.
+    Stops early when a single summary is left, even if it is over budget.
+    """
+    count = tokenizer or estimate_tokens
+    level = 0
+    while (
+        len(summaries) > 1
+        and count(_build_overall_prompt(target_date, summaries)) > token_budget
+    ):
+        level += 1
+        fan_in = choose_fan_in(target_date, summaries, token_budget, tokenizer)
+        groups = [
+            summaries[i : i + fan_in] for i in range(0, len(summaries), fan_in)
+        ]
+        logger.info(
+            "Reduction level {}: {} summaries into {} groups of up to {}",
+            level,
+            len(summaries),
+            len(groups),
+            fan_in,
+        )
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            summaries = list(
+                pool.map(
+                    lambda item: _merge_group(
+                        client, model, target_date, level, item[0], item[1], resources
+                    ),
+                    enumerate(groups, start=1),
+                )
+            )
+    return summaries
+
+
 def summarize_overall(
     client: OpenAI,
     model: str,
@@ -142,14 +552,51 @@ def summarize_overall(
     summaries: list[dict[str, Any]],
     *,
     on_response: Callable[[dict[str, Any]], None] | None = None,
+    token_budget: int | None = None,
+    tokenizer: Tokenizer | None = None,
+    max_concurrency: int = 1,
+    resources: LLMResources | None = None,
 ) -> dict[str, Any]:
+    """Condense chunk ``summaries`` into the overall digest.
+
+    With a ``token_budget``, summaries that would not fit one prompt are
+    first tree-reduced by ``reduce_summaries``.
+    """
     if not summaries:
         return {}
+    if token_budget:
+        summaries = reduce_summaries(
+            client,
+            model,
+            target_date,
+            summaries,
+            token_budget=token_budget,
+            tokenizer=tokenizer,
+            max_concurrency=max_concurrency,
+            resources=resources,
+        )
     prompt = _build_overall_prompt(target_date, summaries)
     logger.info("Summarizing overall digest with {} chunks", len(summaries))
-    text_output, raw_payload = _call_model_with_fallback(client, model, prompt)
+    text_output, raw_payload = _call_model_with_fallback(
+        client,
+        model,
+        prompt,
+        resources,
+        target_date=target_date,
+        purpose="overall",
+        validate=summary_validator(resources),
+    )
     if on_response:
         on_response(raw_payload)
+    if resources and resources.structured:
+        return parse_or_repair(
+            client,
+            model,
+            text_output,
+            resources,
+            target_date=target_date,
+            purpose="overall",
+        )
     try:
         return json.loads(text_output)
     except json.JSONDecodeError:
@@ -157,24 +604,191 @@ def summarize_overall(
         return _extract_json(text_output)
 
 
+# (text output, raw payload), seconds spent in the request, model that answered
+_Outcome = tuple[tuple[str, dict[str, Any]], float, str]
+
+
 def _call_model_with_fallback(
-    client: OpenAI, model: str, prompt: str
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    resources: LLMResources | None = None,
+    *,
+    target_date: date | None = None,
+    purpose: str = "",
+    hedge: bool = False,
+    validate: Callable[[str], bool] | None = None,
 ) -> tuple[str, dict[str, Any]]:
-    use_responses = model.lower().startswith("gpt")
-    if use_responses:
-        try:
-            response = client.responses.create(
-                model=model,
-                input=prompt,
-                temperature=0.2,
+    """Call ``model`` through the cache, scheduler, hedger and provider pool.
+
+    Completions are cached under the requested ``model`` whichever model
+    answered, and only when ``validate`` accepts the text, so a malformed
+    answer is never replayed; a cached one that fails is dropped.
+    """
+    cache = resources.cache if resources else None
+    cache_key = LLMCache.key(model, PROMPT_TEMPLATE_VERSION, prompt)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None and validate and not validate(cached[0]):
+            logger.warning("Dropping invalid cached completion for {}", purpose)
+            cache.discard(cache_key)
+            cached = None
+        if cached is not None:
+            logger.info("Reusing cached completion for model {}", model)
+            _record_call(
+                resources, target_date, model, purpose, prompt, cached, 0.0, cached=True
             )
-            return response.output_text, _to_payload(response)
-        except Exception as exc:  # fallback for models that don't support /responses
-            logger.warning(
-                "Responses API failed for model {}, falling back to chat.completions: {}",
-                model,
-                exc,
+            return cached
+
+    hedger = resources.hedger if resources and hedge else None
+    if hedger is None:
+        result, seconds, used_model = _attempt(client, model, prompt, resources)
+    else:
+        backup_model = resources.hedge_model or model
+
+        def discard(outcome: _Outcome) -> None:
+            result, seconds, used_model = outcome
+            logger.info("Discarded hedged {} answer from {}", purpose, used_model)
+            _record_call(
+                resources,
+                target_date,
+                used_model,
+                purpose,
+                prompt,
+                result,
+                seconds,
+                discarded=True,
             )
+
+        outcome, backup_won = hedger.run(
+            lambda sent: _attempt(client, model, prompt, resources, sent),
+            lambda sent: _attempt(client, backup_model, prompt, resources, sent),
+            on_discard=discard,
+        )
+        result, seconds, used_model = outcome
+        hedger.observe(seconds)
+        if backup_won:
+            logger.info("Hedged {} answered first by {}", purpose, used_model)
+    text_output, raw_payload = result
+    _record_call(resources, target_date, used_model, purpose, prompt, result, seconds)
+    if cache and (validate is None or validate(text_output)):
+        cache.put(cache_key, used_model, text_output, raw_payload)
+    return text_output, raw_payload
+
+
+def _attempt(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    resources: LLMResources | None,
+    sent: threading.Event | None = None,
+) -> _Outcome:
+    def request(endpoint: OpenAI) -> _Outcome:
+        if sent is not None:
+            sent.set()
+        started = time.monotonic()
+        result = _call_model(endpoint, model, prompt, resources)
+        return result, time.monotonic() - started, model
+
+    def timed_call() -> _Outcome:
+        providers = resources.providers if resources else None
+        return providers.call(request) if providers else request(client)
+
+    slots = resources.slots if resources else None
+    scheduler = resources.scheduler if resources else None
+    if scheduler is not None:
+        return scheduler.run(model, estimate_tokens(prompt), timed_call, slots=slots)
+    if slots is None:
+        return timed_call()
+    with slots:
+        return timed_call()
+
+
+def _record_call(
+    resources: LLMResources | None,
+    target_date: date | None,
+    model: str,
+    purpose: str,
+    prompt: str,
+    result: tuple[str, dict[str, Any]],
+    seconds: float,
+    *,
+    cached: bool = False,
+    discarded: bool = False,
+) -> None:
+    ledger = resources.ledger if resources else None
+    if ledger is None or target_date is None:
+        return
+    text_output, raw_payload = result
+    usage = usage_from_payload(raw_payload)
+    estimated = usage is None
+    if usage is None:
+        usage = (estimate_tokens(prompt), estimate_tokens(text_output))
+    ledger.record(
+        target_date,
+        model=model,
+        purpose=purpose,
+        prompt_tokens=usage[0],
+        completion_tokens=usage[1],
+        seconds=seconds,
+        cached=cached,
+        estimated=estimated,
+        discarded=discarded,
+    )
+
+
+# Status codes that mean the endpoint does not implement an API at all, as
+# opposed to transient failures that should not be remembered.
+UNSUPPORTED_STATUS_CODES = frozenset({404, 405, 501})
+
+# 400 and 422 also cover oversized prompts and bad arguments, so they only
+# count as "unsupported" when the error names what was rejected.
+REJECTED_REQUEST_CODES = frozenset({400, 422})
+
+
+def _is_unsupported(exc: APIStatusError, *names: str) -> bool:
+    """Whether ``exc`` says the endpoint lacks an API or parameter for good."""
+    if exc.status_code in UNSUPPORTED_STATUS_CODES:
+        return True
+    if exc.status_code not in REJECTED_REQUEST_CODES:
+        return False
+    message = str(exc).lower()
+    return any(name in message for name in names)
+
+
+def _call_model(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    resources: LLMResources | None = None,
+) -> tuple[str, dict[str, Any]]:
+    registry = resources.capabilities if resources else None
+    if resources and resources.structured:
+        result = _call_structured(client, model, prompt, registry)
+        if result is not None:
+            return result
+    if resources and resources.stream:
+        return _call_chat_stream(client, model, prompt, registry)
+    base_url = str(client.base_url)
+    use_responses = model.lower().startswith("gpt")
+    if use_responses and registry:
+        known = registry.get(base_url, model, "responses")
+        if known is None:
+            # Probe once; concurrent chunks wait here and reuse the answer.
+            with registry.probe_lock(base_url, model, "responses"):
+                known = registry.get(base_url, model, "responses")
+                if known is None:
+                    result = _call_responses(client, model, prompt, registry)
+                    if result is not None:
+                        return result
+                    # A failure that was not recorded still rules out a
+                    # second try for this call; later calls probe again.
+                    known = False
+        use_responses = known is not False
+    if use_responses:
+        result = _call_responses(client, model, prompt, registry)
+        if result is not None:
+            return result
     completion = client.chat.completions.create(
         model=model,
         messages=[{"role": "user", "content": prompt}],
@@ -183,6 +797,193 @@ def _call_model_with_fallback(
     return completion.choices[0].message.content or "", _to_payload(completion)
 
 
+# Malformed streams are retried this many times before the last attempt is
+# read to the end and left to the regular fallback parsing.
+STREAM_RETRIES = 1
+
+
+def _open_chat_stream(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    registry: CapabilityRegistry | None,
+) -> Any:
+    """Start a streamed chat completion that reports usage when supported."""
+    options: dict[str, Any] = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.2,
+        "stream": True,
+    }
+    base_url = str(client.base_url)
+    if registry and registry.get(base_url, model, "stream_usage") is False:
+        return client.chat.completions.create(**options)
+    try:
+        stream = client.chat.completions.create(
+            **options, stream_options={"include_usage": True}
+        )
+    except APIStatusError as exc:
+        if not _is_unsupported(exc, "stream_options", "include_usage"):
+            raise
+        logger.warning("Model {} rejects stream_options, usage is estimated", model)
+        if registry:
+            registry.record(base_url, model, "stream_usage", False)
+        return client.chat.completions.create(**options)
+    if registry:
+        registry.record(base_url, model, "stream_usage", True)
+    return stream
+
+
+def _call_chat_stream(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    registry: CapabilityRegistry | None = None,
+) -> tuple[str, dict[str, Any]]:
+    """Stream a chat completion, validating the JSON as it arrives.
+
+    Output that can no longer become a JSON object aborts the stream and
+    starts a fresh generation instead of waiting for it to finish.
+    """
+    for attempt in range(STREAM_RETRIES + 1):
+        strict = attempt < STREAM_RETRIES
+        validator = JsonStreamValidator()
+        parts: list[str] = []
+        usage: dict[str, Any] | None = None
+        first_theme: float | None = None
+        error: JsonStreamError | None = None
+        started = time.monotonic()
+        stream = _open_chat_stream(client, model, prompt, registry)
+        try:
+            for event in stream:
+                if event.usage is not None:
+                    usage = _to_payload(event.usage)
+                delta = event.choices[0].delta.content if event.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                if error is not None:
+                    continue
+                try:
+                    validator.feed(delta)
+                except JsonStreamError as exc:
+                    if strict:
+                        raise
+                    error = exc
+                if first_theme is None and validator.themes:
+                    first_theme = time.monotonic() - started
+            if error is None:
+                validator.close()
+        except JsonStreamError as exc:
+            if strict:
+                logger.warning(
+                    "Malformed JSON streamed by {} after {} chars ({}), retry {}/{}",
+                    model,
+                    validator.consumed,
+                    exc,
+                    attempt + 1,
+                    STREAM_RETRIES,
+                )
+                continue
+            error = exc
+        finally:
+            stream.close()
+        if error is not None:
+            logger.warning(
+                "Streamed output from {} is not valid JSON: {}", model, error
+            )
+        text_output = "".join(parts)
+        elapsed = time.monotonic() - started
+        if first_theme is not None:
+            logger.debug(
+                "First theme from {} after {:.1f}s of {:.1f}s",
+                model,
+                first_theme,
+                elapsed,
+            )
+        return text_output, {
+            "object": "chat.completion.stream",
+            "model": model,
+            "output_text": text_output,
+            "usage": usage,
+            "attempts": attempt + 1,
+            "seconds": round(elapsed, 3),
+            "seconds_to_first_theme": (
+                round(first_theme, 3) if first_theme is not None else None
+            ),
+        }
+    raise AssertionError("unreachable")
+
+
+def _call_structured(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    registry: CapabilityRegistry | None,
+) -> tuple[str, dict[str, Any]] | None:
+    """Chat completion constrained to ``SUMMARY_SCHEMA``, or ``None`` if unsupported."""
+    base_url = str(client.base_url)
+    if registry and registry.get(base_url, model, "json_schema") is False:
+        return None
+    try:
+        completion = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            response_format=SUMMARY_RESPONSE_FORMAT,
+        )
+    except APIStatusError as exc:
+        unsupported = _is_unsupported(exc, "response_format", "json_schema")
+        if not unsupported and exc.status_code not in REJECTED_REQUEST_CODES:
+            raise
+        logger.warning(
+            "Structured output failed for model {}, using plain JSON prompts: {}",
+            model,
+            exc,
+        )
+        if registry and unsupported:
+            registry.record(base_url, model, "json_schema", False)
+        return None
+    if registry:
+        registry.record(base_url, model, "json_schema", True)
+    return completion.choices[0].message.content or "", _to_payload(completion)
+
+
+def _call_responses(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    registry: CapabilityRegistry | None,
+) -> tuple[str, dict[str, Any]] | None:
+    base_url = str(client.base_url)
+    try:
+        response = client.responses.create(
+            model=model,
+            input=prompt,
+            temperature=0.2,
+        )
+    except RETRYABLE_ERRORS:
+        raise  # transient, not a sign that /responses is unsupported
+    except Exception as exc:  # fallback for models that don't support /responses
+        logger.warning(
+            "Responses API failed for model {}, falling back to chat.completions: {}",
+            model,
+            exc,
+        )
+        if (
+            registry
+            and isinstance(exc, APIStatusError)
+            and _is_unsupported(
+                exc, "responses", "not supported", "unsupported", "unrecognized"
+            )
+        ):
+            registry.record(base_url, model, "responses", False)
+        return None
+    if registry:
+        registry.record(base_url, model, "responses", True)
+    return response.output_text, _to_payload(response)
+
+
 def _to_payload(obj: Any) -> dict[str, Any]:
     if hasattr(obj, "model_dump"):
         return obj.model_dump()
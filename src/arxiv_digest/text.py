@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import re
+
+
+_WORD = re.compile(r"[a-z][a-z0-9\-]{2,}")
+STOPWORDS = frozenset(
+    """
+    about above after again against also among and any are based because been
+    before being between both but can could does doing during each few for from
+    further has have having here how into its itself just more most new not now
+    off once only other our out over own paper propose proposed same show shows
+    should some such than that the their them then there these they this those
+    through under until using very via was were what when where which while who
+    why will with within without would yet you your approach method methods
+    results model models task tasks work framework present study novel however
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
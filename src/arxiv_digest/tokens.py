@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import Callable
+
+
+Tokenizer = Callable[[str], int]
+
+_WIDE_CHARS = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap estimate: one token per CJK character, one per four other characters."""
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+def get_tokenizer(model: str | None = None) -> Tokenizer:
+    """Exact counts via ``tiktoken`` when it is installed, else ``estimate_tokens``."""
+    try:
+        import tiktoken
+    except ImportError:
+        return estimate_tokens
+    try:
+        encoding = tiktoken.encoding_for_model(model or "")
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import date
+
+from arxiv_digest.accounting import Ledger, format_report, load_ledger
+
+
+DAY = date(2026, 1, 15)
+
+
+def test_batch_calls_stay_out_of_latency_percentiles(tmp_path):
+    ledger = Ledger(str(tmp_path))
+    for seconds in (2.0, 4.0):
+        ledger.record(
+            DAY,
+            model="gpt-4o-mini",
+            purpose="chunk",
+            prompt_tokens=100,
+            completion_tokens=10,
+            seconds=seconds,
+        )
+    for index in range(5):
+        ledger.record(
+            DAY,
+            model="gpt-4o-mini",
+            purpose=f"batch chunk {index}",
+            prompt_tokens=100,
+            completion_tokens=10,
+            seconds=3600.0,
+            batched=True,
+        )
+
+    report = format_report(load_ledger(str(tmp_path)))
+    total = next(line for line in report.splitlines() if line.startswith("total"))
+
+    assert total.split()[-4:] == ["2.0", "4.0", "4.0", "4.0"]
+    assert "batch calls: 5, left out of the latency columns" in report
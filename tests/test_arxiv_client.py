@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from arxiv_digest.arxiv_client import ArxivHttpClient, _parse_page
+from arxiv_digest.http_cache import HttpCache
+
+
+URL = "http://arxiv.test/api/query?search_query=cat:cs.AI"
+
+
+def _entry(i: int) -> str:
+    return (
+        f"<entry><id>http://arxiv.org/abs/2601.{i:05d}v1</id>"
+        "<updated>2026-01-14T10:00:00Z</updated>"
+        "<published>2026-01-14T10:00:00Z</published>"
+        f"<title>T{i}</title><summary>S{i}</summary>"
+        "<author><name>A</name></author>"
+        f'<link href="http://arxiv.org/abs/2601.{i:05d}v1" rel="alternate"/>'
+        '<category term="cs.AI"/></entry>'
+    )
+
+
+FEED = (
+    '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+    '<opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+    "3</opensearch:totalResults>"
+    + "".join(_entry(i) for i in range(3))
+    + "</feed>"
+).encode()
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """Sends the first half of the feed, then drops the connection."""
+
+    async def __aiter__(self):
+        yield FEED[: len(FEED) // 2]
+        raise httpx.RemoteProtocolError("peer closed connection")
+
+
+def _client(
+    cuts: int, cache: HttpCache | None = None
+) -> tuple[ArxivHttpClient, list[int]]:
+    requests: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(1)
+        if len(requests) <= cuts:
+            return httpx.Response(200, stream=BrokenStream())
+        return httpx.Response(200, content=FEED, headers={"ETag": '"v1"'})
+
+    client = ArxivHttpClient(
+        min_interval=0, max_retries=2, backoff_base=0, backoff_cap=0, cache=cache
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+def test_page_cut_off_mid_body_is_refetched(tmp_path):
+    cache = HttpCache(tmp_path)
+    client, requests = _client(cuts=1, cache=cache)
+
+    papers, total = asyncio.run(_parse_page(client, URL, ["cs.AI"], None))
+
+    assert len(requests) == 2
+    assert total == 3
+    assert [paper.title for paper in papers] == ["T0", "T1", "T2"]
+    assert client.stats.retries == 1
+    assert cache.lookup(URL) is not None
+
+
+def test_page_cut_off_too_often_raises():
+    client, requests = _client(cuts=10)
+
+    with pytest.raises(httpx.RemoteProtocolError):
+        asyncio.run(_parse_page(client, URL, ["cs.AI"], None))
+    assert len(requests) == 3
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+import json
+
+import httpx
+from openai import OpenAI
+
+from arxiv_digest.batch import summarize_papers_batch
+from arxiv_digest.llm_cache import LLMCache
+from arxiv_digest.llm_scheduler import LLMScheduler
+from arxiv_digest.models import Paper
+from arxiv_digest.summarizer import LLMResources
+
+
+TARGET = date(2026, 1, 15)
+MODEL = "test-model"
+GOOD = json.dumps({"summary": "s", "keywords": ["k"], "themes": []})
+# Parses, but misses "keywords", so structured mode asks for a repair.
+INCOMPLETE = json.dumps({"summary": "s", "themes": []})
+
+
+def _paper(i: int) -> Paper:
+    moment = datetime(2026, 1, 14, 12)
+    return Paper(
+        paper_id=f"2601.0000{i}v1",
+        title=f"Paper {i}",
+        summary="An abstract.",
+        authors=["A. Author"],
+        link=f"https://arxiv.org/abs/2601.0000{i}v1",
+        categories=["cs.AI"],
+        published=moment,
+        updated=moment,
+    )
+
+
+PAPERS = [_paper(1), _paper(2)]
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": MODEL,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+class FakeBatchServer:
+    """Stand-in for the Files, Batches and chat completion endpoints."""
+
+    def __init__(
+        self, outputs: dict[str, str] | None = None, poll_errors: int = 0
+    ) -> None:
+        self.outputs = outputs or {}
+        self.poll_errors = poll_errors
+        self.batches: list[list[str]] = []
+        self.chat_calls = 0
+        self.polls = 0
+
+    def client(self) -> OpenAI:
+        return OpenAI(
+            api_key="test",
+            base_url="http://llm.test/v1",
+            max_retries=0,
+            http_client=httpx.Client(transport=httpx.MockTransport(self.handle)),
+        )
+
+    def _batch(self, status: str) -> dict:
+        return {
+            "id": f"batch-{len(self.batches)}",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "status": status,
+            "created_at": 100,
+            "completed_at": 160 if status == "completed" else None,
+            "output_file_id": "file-out" if status == "completed" else None,
+            "request_counts": {"total": 2, "completed": 0, "failed": 0},
+        }
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files" and request.method == "POST":
+            lines = [
+                json.loads(line)
+                for line in request.content.decode().splitlines()
+                if line.startswith('{"custom_id"')
+            ]
+            self.batches.append([line["custom_id"] for line in lines])
+            return httpx.Response(
+                200,
+                json={
+                    "id": "file-in",
+                    "object": "file",
+                    "bytes": len(request.content),
+                    "created_at": 0,
+                    "filename": "input.jsonl",
+                    "purpose": "batch",
+                    "status": "processed",
+                },
+            )
+        if path == "/v1/batches":
+            return httpx.Response(200, json=self._batch("validating"))
+        if path.startswith("/v1/batches/"):
+            self.polls += 1
+            if self.poll_errors:
+                self.poll_errors -= 1
+                return httpx.Response(503, json={"error": {"message": "busy"}})
+            status = "in_progress" if self.polls == 1 else "completed"
+            return httpx.Response(200, json=self._batch(status))
+        if path == "/v1/files/file-out/content":
+            lines = [
+                json.dumps(
+                    {
+                        "id": f"r-{custom_id}",
+                        "custom_id": custom_id,
+                        "response": {
+                            "status_code": 200,
+                            "request_id": "req",
+                            "body": _completion(self.outputs.get(custom_id, GOOD)),
+                        },
+                        "error": None,
+                    }
+                )
+                for custom_id in self.batches[-1]
+            ]
+            return httpx.Response(200, content="\n".join(lines).encode())
+        if path == "/v1/chat/completions":
+            self.chat_calls += 1
+            return httpx.Response(200, json=_completion(GOOD))
+        return httpx.Response(404, json={"error": {"message": f"no route {path}"}})
+
+
+def _run(server: FakeBatchServer, tmp_path, resources: LLMResources | None = None):
+    jobs: list[dict] = []
+    results = summarize_papers_batch(
+        server.client(),
+        MODEL,
+        TARGET,
+        PAPERS,
+        input_path=tmp_path / "input.jsonl",
+        chunk_size=1,
+        on_job=jobs.append,
+        poll_interval=0,
+        resources=resources,
+    )
+    return results, jobs
+
+
+def test_submits_polls_and_parses_results(tmp_path):
+    server = FakeBatchServer()
+
+    results, jobs = _run(server, tmp_path)
+
+    assert server.batches == [["chunk-001", "chunk-002"]]
+    assert server.polls == 2
+    assert server.chat_calls == 0
+    assert [index for index, _ in results] == [1, 2]
+    assert results[0][1]["keywords"] == ["k"]
+    assert [job["status"] for job in jobs] == ["validating", "consumed"]
+
+
+def test_poll_errors_are_retried(tmp_path):
+    server = FakeBatchServer(poll_errors=1)
+    scheduler = LLMScheduler(backoff_base=0, backoff_cap=0)
+
+    results, _ = _run(server, tmp_path, LLMResources(scheduler=scheduler))
+
+    assert len(results) == 2
+    assert scheduler.stats.retries == 1
+
+
+def test_invalid_result_is_repaired(tmp_path):
+    server = FakeBatchServer(outputs={"chunk-001": INCOMPLETE})
+
+    results, _ = _run(server, tmp_path, LLMResources(structured=True))
+
+    assert server.chat_calls == 1
+    assert dict(results)[1]["keywords"] == ["k"]
+
+
+def test_cached_chunks_are_not_resubmitted(tmp_path):
+    cache = LLMCache(tmp_path / "cache")
+    first = FakeBatchServer()
+    _run(first, tmp_path, LLMResources(cache=cache))
+
+    second = FakeBatchServer()
+    results, jobs = _run(second, tmp_path, LLMResources(cache=cache))
+
+    assert second.batches == []
+    assert second.chat_calls == 0
+    assert jobs == []
+    assert [index for index, _ in results] == [1, 2]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from arxiv_digest import main
+from arxiv_digest.config import AppConfig
+from arxiv_digest.models import Paper
+from arxiv_digest.storage import (
+    _date_dir,
+    load_chunk_plan,
+    load_state,
+    save_state,
+    update_state_with_papers,
+)
+
+
+TARGET = date(2026, 1, 15)
+
+
+def _paper(paper_id: str) -> Paper:
+    moment = datetime(2026, 1, 14, 12)
+    return Paper(
+        paper_id=paper_id,
+        title=f"Paper {paper_id}",
+        summary="An abstract.",
+        authors=["A. Author"],
+        link=f"https://arxiv.org/abs/{paper_id}",
+        categories=["cs.AI"],
+        published=moment,
+        updated=moment,
+    )
+
+
+def test_resume_summarizes_the_papers_the_plan_was_made_for(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_CHUNK_MAX_PAPERS", "1")
+    monkeypatch.setenv("OPENAI_CACHE", "0")
+    config = AppConfig.from_env()
+
+    papers = [_paper(f"2601.0000{i}v1") for i in range(1, 5)]
+    # The first paper was already mailed on an earlier day.
+    state = update_state_with_papers(load_state(config.data_dir), date.today(), papers[:1])
+    save_state(config.data_dir, state)
+
+    calls: list[tuple[list[list[str]], set[int]]] = []
+
+    def summarize(client, model, target_date, new_papers, **kwargs):
+        chunks = kwargs["chunks"]
+        existing = kwargs["existing_chunks"]
+        calls.append(
+            ([[paper.paper_id for paper in chunk] for chunk in chunks], set(existing))
+        )
+        results = []
+        for idx, chunk in enumerate(chunks, start=1):
+            summary = existing.get(idx) or {"papers": [p.paper_id for p in chunk]}
+            if idx not in existing:
+                kwargs["on_summary"](idx, summary)
+            results.append((idx, summary))
+        return results
+
+    monkeypatch.setattr(main, "_fetch", lambda *args, **kwargs: papers)
+    monkeypatch.setattr(main, "summarize_papers_stream", summarize)
+    monkeypatch.setattr(main, "summarize_overall", lambda *args, **kwargs: {})
+    monkeypatch.setattr(main, "_send_digest", lambda *args, **kwargs: None)
+
+    main._run_once(config, TARGET)
+    plan = [["2601.00002v1"], ["2601.00003v1"], ["2601.00004v1"]]
+    assert load_chunk_plan(config.data_dir, TARGET) == plan
+
+    summaries_dir = _date_dir(config.data_dir, TARGET) / "summaries"
+    (summaries_dir / "summary_part02.json").unlink()
+    main._run_once(config, TARGET)
+
+    assert calls[-1] == (plan, {1, 3})
+    assert load_chunk_plan(config.data_dir, TARGET) == plan
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import httpx
+from openai import APIStatusError
+
+from arxiv_digest.capabilities import CapabilityRegistry
+from arxiv_digest.summarizer import LLMResources, _call_model
+
+
+def _status_error(status: int, message: str) -> APIStatusError:
+    request = httpx.Request("POST", "http://llm.test/v1/responses")
+    return APIStatusError(
+        message, response=httpx.Response(status, request=request), body=None
+    )
+
+
+class FakeClient:
+    base_url = "http://llm.test/v1/"
+
+    def __init__(self, responses_error: APIStatusError) -> None:
+        self.calls: list[str] = []
+        self.responses = SimpleNamespace(create=self._responses)
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._chat)
+        )
+        self._responses_error = responses_error
+
+    def _responses(self, **kwargs):
+        self.calls.append("responses")
+        raise self._responses_error
+
+    def _chat(self, **kwargs):
+        self.calls.append("chat")
+        message = SimpleNamespace(content='{"summary": "ok"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_unrecorded_probe_failure_falls_back_to_chat_once(tmp_path):
+    registry = CapabilityRegistry(str(tmp_path))
+    client = FakeClient(_status_error(400, "maximum context length exceeded"))
+
+    text, _ = _call_model(
+        client, "gpt-4o-mini", "prompt", LLMResources(capabilities=registry)
+    )
+
+    assert text == '{"summary": "ok"}'
+    assert client.calls == ["responses", "chat"]
+    assert registry.get(client.base_url, "gpt-4o-mini", "responses") is None
+
+
+def test_unsupported_responses_is_remembered(tmp_path):
+    registry = CapabilityRegistry(str(tmp_path))
+    client = FakeClient(_status_error(404, "not found"))
+    resources = LLMResources(capabilities=registry)
+
+    _call_model(client, "gpt-4o-mini", "prompt", resources)
+    _call_model(client, "gpt-4o-mini", "prompt", resources)
+
+    assert client.calls == ["responses", "chat", "chat"]